@@ -1 +1,13 @@
-from .series import Series, ListStats
+# `Series` and `ListStats` (and their dependencies) are loaded on first access,
+# see `__getattr__`
+__all__ = ['Series', 'ListStats']
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import series
+        return getattr(series, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,175 @@
+"""asyncio client, built on aiohttp (`pip install aiohttp`).
+
+`AsyncSeries` and `AsyncListStats` are `Series` and `ListStats` whose
+`populate()` is a coroutine; the webpages are parsed by the same code. Their
+`session` is an `aiohttp.ClientSession` (one is opened for each `populate()`
+call if none is given). `fetch_series_many` keeps many series requests in
+flight at once, under a global rate limit.
+"""
+
+import asyncio
+
+from .ratelimit import RateLimiter
+from .series import Series, ListStats
+from .utils import decode_html
+
+
+async def _get(session, url, params):
+    """GETs `url`, with a temporary session if `session` is None
+
+    Returns:
+        - tuple(bytes, str): Content, and its encoding from the HTTP headers
+            (or None)
+    """
+
+    if session is None:
+        import aiohttp
+        async with aiohttp.ClientSession() as session:
+            return await _get(session, url, params)
+
+    async with session.get(url, params=params) as response:
+        response.raise_for_status()
+        return await response.read(), response.charset
+
+
+class AsyncSeries(Series):
+    """`Series` whose `populate()` is a coroutine (see `Series`)
+
+    The series it links to (`related_series`, ...) are `AsyncSeries` too, and
+    `list_stats` is an `AsyncListStats`, sharing the same session.
+    """
+
+    @property
+    def session(self):
+        """The aiohttp.ClientSession used to load the webpage (or None)"""
+
+        return self._session
+
+    async def populate(self, fields=None, retain_html=True):
+        """Re/loads the series webpage (see `Series.populate()`).
+
+        Arguments:
+            - fields (iterable of str), retain_html (bool):
+                Optional. See `Series.populate()`. Reading only part of the
+                page (`stream=True`) isn't supported.
+        Raises:
+            - ValueError: If `fields` has an unknown property name
+            - aiohttp.ClientResponseError: If the response has an error status
+        """
+
+        fields = self._check_fields(fields)
+        content, encoding = await _get(self._session, f'{self.domain}/series.html',
+                                       {'id': self.id})
+        self._load(decode_html(content, encoding), fields, True, retain_html)
+
+    def _child_list_stats(self, **totals):
+        return AsyncListStats(self.id, session=self._session, parser=self._parser, **totals)
+
+    @classmethod
+    def fetch_many(cls, *args, **kwargs):
+        """Not supported: `Series.fetch_many` runs `populate()` on threads
+
+        Raises:
+            - TypeError: Always (use `fetch_series_many` instead)
+        """
+
+        raise TypeError('AsyncSeries.fetch_many() is not supported: '
+                        'use `async for ... in mangaupdates.aio.fetch_series_many(ids)`')
+
+
+class AsyncListStats(ListStats):
+    """`ListStats` whose `populate()` is a coroutine (see `ListStats`)"""
+
+    @property
+    def session(self):
+        """The aiohttp.ClientSession used to load the webpages (or None)"""
+
+        return self._session
+
+    async def populate(self, delay=2, list_names=None, limiter=None):
+        """Re/loads the various List webpages for the series (see
+        `ListStats.populate()`).
+
+        Arguments:
+            - delay (float), list_names (iterable of str):
+                Optional. See `ListStats.populate()`. `delay` is ignored if
+                a `limiter` is given, which spaces out the requests instead.
+            - limiter (RateLimiter):
+                Optional. Limits the rate of the requests (e.g. shared with
+                `fetch_series_many` or other threads). Defaults to None.
+        """
+
+        if list_names is None:
+            list_names = ('read', 'wish', 'unfinished', 'complete', 'hold')
+
+        for i, list_name in enumerate(list_names):
+            if limiter is not None:
+                await limiter.wait()
+            content, encoding = await _get(self._session, f'{self.domain}/series.html',
+                                           {'act': 'list', 'sid': self.id, 'list': list_name})
+            self._load(list_name, content, encoding)
+
+            if limiter is None and i+1 < len(list_names):
+                await asyncio.sleep(delay)
+
+
+async def fetch_series_many(ids, concurrency=10, rate=None, session=None, fields=None,
+                            retain_html=True, **kwargs):
+    """Populates the series `ids`, with up to `concurrency` requests at once.
+
+    Arguments:
+        - ids (iterable of int): Series ids (consumed as needed)
+        - concurrency (int): Optional. Maximum requests in flight. Defaults to 10.
+        - rate (float or ratelimit.RateLimiter):
+            Optional. Maximum requests started per second, across all of them,
+            or a `RateLimiter` (which also counts the requests of the threads
+            and coroutines that share it). Defaults to None (no limit).
+        - session (aiohttp.ClientSession):
+            Optional. Session shared by every series. Defaults to None (a new
+            one, sized for `concurrency`, closed when done).
+        - fields (iterable of str), retain_html (bool):
+            Optional. See `Series.populate()`.
+        - **kwargs: `parser`, `identity_map` (see `Series.__init__`).
+    Yields:
+        - tuple(int, AsyncSeries or Exception): Each id with its populated
+            series, or the exception raised while fetching or parsing it, in
+            completion order
+    """
+
+    if session is None:
+        import aiohttp
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            async for result in fetch_series_many(ids, concurrency, rate, session, fields,
+                                                  retain_html, **kwargs):
+                yield result
+        return
+
+    limiter = rate if rate is None or isinstance(rate, RateLimiter) else RateLimiter(rate)
+
+    async def fetch(id):
+        try:
+            series = AsyncSeries(id, session=session, **kwargs)
+            if limiter is not None:
+                await limiter.wait()
+            await series.populate(fields=fields, retain_html=retain_html)
+            return id, series
+        except Exception as e:
+            return id, e
+
+    ids = iter(ids)
+    pending = set()
+    try:
+        while True:
+            for id in ids:
+                pending.add(asyncio.create_task(fetch(id)))
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,357 @@
+"""Response cache for the requests sent to the site.
+
+`CachedSession` wraps a `requests.Session` (or anything with its `get()`) and
+can be passed as the `session` of `Series` and `ListStats`, or used by the
+scripts. Successful responses are stored, compressed, in a `FileCache` or a
+`SQLiteCache`, keyed by URL and query parameters. They expire after the TTL
+of their page type (`TTLS`), and the least recently used ones are evicted once
+the cache grows past `max_size` bytes.
+
+An expired response is revalidated instead of being downloaded again: the
+request carries its `ETag`/`Last-Modified` validators, and on a 304 (or a body
+that hashes the same as the stored one) the stored response is renewed and
+returned.
+"""
+
+from dataclasses import dataclass, field, replace
+from collections import OrderedDict
+from urllib.parse import urlencode, urlparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+# page type (see `page_type`) -> seconds a cached page is used for
+TTLS = {'series': 24 * 60 * 60,
+        'list': 24 * 60 * 60,
+        'stats': 60 * 60,
+        None: 60 * 60}
+
+MAX_SIZE = 256 * 1024 * 1024
+
+# headers that describe the body as it was sent, not as it is stored
+_transfer_headers = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+def page_type(url, params=None):
+    """'series', 'list' (of users), 'stats' (most listed series) or None"""
+
+    path = urlparse(url).path
+    if path.endswith('/stats.html'):
+        return 'stats'
+    if path.endswith('/series.html'):
+        return 'list' if (params or {}).get('act') == 'list' else 'series'
+    return None
+
+def cache_key(url, params=None):
+    """`url` with the query of `params`, in a canonical (sorted) order"""
+
+    query = urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return f'{url}?{query}' if query else url
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    content: bytes
+    encoding: str = None
+    headers: dict = field(default_factory=dict)
+    stored: float = field(default_factory=time.time)   # `time.time()`
+    digest: str = None  # SHA-1 of `content` (hex)
+
+    def __post_init__(self):
+        if self.digest is None:
+            self.digest = hashlib.sha1(self.content).hexdigest()
+
+    def validators(self):
+        """Headers of a conditional request for this response"""
+
+        headers = {k.lower(): v for k, v in self.headers.items()}
+        validators = {}
+        if 'etag' in headers:
+            validators['If-None-Match'] = headers['etag']
+        if 'last-modified' in headers:
+            validators['If-Modified-Since'] = headers['last-modified']
+        return validators
+
+    @classmethod
+    def from_response(cls, response):
+        headers = {k: v for k, v in response.headers.items()
+                   if k.lower() not in _transfer_headers}
+        return cls(url=response.url, content=response.content,
+                   encoding=response.encoding, headers=headers)
+
+    def response(self):
+        """`requests.Response` with the stored body (`from_cache` is True,
+        `digest` is set)"""
+
+        import requests
+
+        response = requests.Response()
+        response._content = self.content
+        response._content_consumed = True   # `iter_content()` slices `content`
+        response.status_code = 200
+        response.url = self.url
+        response.encoding = self.encoding
+        response.headers.update(self.headers)
+        response.from_cache = True
+        response.digest = self.digest
+        return response
+
+
+class Cache:
+    """Base class of the cache backends, which implement `_load`, `_store`,
+    `_delete` and `_evict`. Thread-safe.
+
+    Arguments:
+        - max_size (int):
+            Optional. Bytes (compressed) kept before the least recently used
+            entries are evicted. Defaults to `MAX_SIZE`.
+        - ttls (dict):
+            Optional. `{page type: seconds}` overriding those of `TTLS`.
+
+    Attributes:
+        - hits, misses (int): Counters of `get()` (expired responses are misses)
+        - revalidated (int): Expired responses found to be unchanged (see
+            `CachedSession`)
+    """
+
+    def __init__(self, max_size=MAX_SIZE, ttls=None):
+        self.max_size = max_size
+        self.ttls = {**TTLS, **(ttls or {})}
+        self.hits = self.misses = self.revalidated = 0
+        self._lock = threading.RLock()
+
+    def expired(self, entry, kind=None):
+        """Whether `entry` is older than the TTL of the page type `kind`"""
+
+        return time.time() - entry.stored > self.ttls.get(kind, TTLS[None])
+
+    def get(self, key, kind=None, stale=False):
+        """The `CachedResponse` stored under `key`, or None if there is none or
+        it's older than the TTL of the page type `kind` (deleted, unless
+        `stale`, in which case it's returned anyway to be revalidated)"""
+
+        with self._lock:
+            entry = self._load(key)
+            if entry is None or self.expired(entry, kind):
+                self.misses += 1
+                if entry is not None and not stale:
+                    self._delete(key)
+                    entry = None
+            else:
+                self.hits += 1
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._store(key, entry)
+            self._evict()
+
+    def renew(self, key, entry):
+        """Stores `entry` again as if it had just been downloaded (it was
+        found to be unchanged), and returns it"""
+
+        entry = replace(entry, stored=time.time())
+        with self._lock:
+            self.revalidated += 1
+            self.set(key, entry)
+        return entry
+
+    @staticmethod
+    def _dumps(entry):
+        """Compressed header (JSON) and body of `entry`"""
+
+        header = json.dumps({'url': entry.url, 'encoding': entry.encoding,
+                             'headers': entry.headers, 'stored': entry.stored,
+                             'digest': entry.digest})
+        return zlib.compress(header.encode()), zlib.compress(entry.content)
+
+    @staticmethod
+    def _loads(header, body):
+        return CachedResponse(content=zlib.decompress(body),
+                              **json.loads(zlib.decompress(header)))
+
+
+class FileCache(Cache):
+    """Cache with one file per response in `directory` (created if needed).
+    See `Cache` for the other arguments.
+    """
+
+    def __init__(self, directory, max_size=MAX_SIZE, ttls=None):
+        super().__init__(max_size, ttls)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+        # file name -> size, least recently used first (by modification time,
+        # which is updated on every hit)
+        files = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith('.cache') and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        self._sizes = OrderedDict((name, size) for _, name, size in sorted(files))
+        self._size = sum(self._sizes.values())
+
+    def __repr__(self):
+        return f'FileCache({repr(self.directory)})'
+
+    @staticmethod
+    def _name(key):
+        return hashlib.sha1(key.encode()).hexdigest() + '.cache'
+
+    def _load(self, key):
+        name = self._name(key)
+        if name not in self._sizes:
+            return None
+        path = os.path.join(self.directory, name)
+        with open(path, 'rb') as f:
+            header = f.read(int(f.readline()))
+            entry = self._loads(header, f.read())
+        os.utime(path)
+        self._sizes.move_to_end(name)
+        return entry
+
+    def _store(self, key, entry):
+        header, body = self._dumps(entry)
+        data = b'%d\n%b%b' % (len(header), header, body)
+        name = self._name(key)
+        path = os.path.join(self.directory, name)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(data)
+        os.replace(path + '.tmp', path)
+
+        self._size += len(data) - self._sizes.pop(name, 0)
+        self._sizes[name] = len(data)
+
+    def _delete(self, key):
+        self._remove(self._name(key))
+
+    def _remove(self, name):
+        try:
+            os.remove(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+        self._size -= self._sizes.pop(name, 0)
+
+    def _evict(self):
+        while self._size > self.max_size and self._sizes:
+            self._remove(next(iter(self._sizes)))
+
+
+class SQLiteCache(Cache):
+    """Cache in the SQLite database `path` (created if needed). See `Cache`
+    for the other arguments.
+    """
+
+    def __init__(self, path, max_size=MAX_SIZE, ttls=None):
+        super().__init__(max_size, ttls)
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS responses ('
+                         'key TEXT PRIMARY KEY, header BLOB, body BLOB, '
+                         'size INTEGER, used REAL)')
+        self._db.execute('CREATE INDEX IF NOT EXISTS responses_used ON responses (used)')
+
+    def __repr__(self):
+        return f'SQLiteCache({repr(self.path)})'
+
+    def close(self):
+        self._db.close()
+
+    def _load(self, key):
+        row = self._db.execute('SELECT header, body FROM responses WHERE key = ?',
+                               (key,)).fetchone()
+        if row is None:
+            return None
+        self._db.execute('UPDATE responses SET used = ? WHERE key = ?', (time.time(), key))
+        return self._loads(*row)
+
+    def _store(self, key, entry):
+        header, body = self._dumps(entry)
+        self._db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                         (key, header, body, len(header) + len(body), time.time()))
+
+    def _delete(self, key):
+        self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+
+    def _evict(self):
+        size, = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()
+        if size <= self.max_size:
+            return
+        evicted = []
+        for key, entry_size in self._db.execute('SELECT key, size FROM responses ORDER BY used'):
+            if size <= self.max_size:
+                break
+            evicted.append((key,))
+            size -= entry_size
+        self._db.executemany('DELETE FROM responses WHERE key = ?', evicted)
+
+
+class CachedSession:
+    """`requests.Session` whose `get()` goes through `cache` first.
+
+    Responses from the cache have `from_cache = True`, and every stored one
+    has the `digest` of its body, which `Series.populate()` compares to skip
+    parsing an unchanged page again (only when the same `Series` instance is
+    populated again, see there). Only successful (200) responses are stored;
+    a streamed response (`stream=True`) is downloaded whole when it's not in
+    the cache, so that it can be stored (or, if it's an error page, so that its
+    connection is released). An expired response is requested again with its
+    validators, and is renewed if the page is unchanged (a 304, or the same
+    body). Any other attribute is that of `session`.
+
+    Arguments:
+        - cache (Cache): e.g. `FileCache('.cache')`
+        - session (requests.Session):
+            Optional. Session that sends the requests. Defaults to None (a
+            `transport.make_session()` is created on the first request).
+    """
+
+    def __init__(self, cache, session=None):
+        self.cache = cache
+        self._session = session
+
+    def __repr__(self):
+        return f'CachedSession({repr(self.cache)})'
+
+    @property
+    def session(self):
+        if self._session is None:
+            from .transport import make_session
+            self._session = make_session()
+        return self._session
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    def get(self, url, params=None, **kwargs):
+        key = cache_key(url, params)
+        kind = page_type(url, params)
+        entry = self.cache.get(key, kind, stale=True)
+        if entry is None:
+            response = self.session.get(url, params=params, **kwargs)
+        elif not self.cache.expired(entry, kind):
+            return entry.response()
+        else:
+            headers = {**entry.validators(), **(kwargs.pop('headers', None) or {})}
+            response = self.session.get(url, params=params, headers=headers, **kwargs)
+            if response.status_code == 304 or (
+                    response.status_code == 200
+                    and hashlib.sha1(response.content).hexdigest() == entry.digest):
+                response.close()
+                return self.cache.renew(key, entry).response()
+
+        response.content    # downloaded whole, error pages too: the connection is released
+        if response.status_code == 200:
+            entry = CachedResponse.from_response(response)
+            self.cache.set(key, entry)
+            response.digest = entry.digest
+        response.from_cache = False
+        return response
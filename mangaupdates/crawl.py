@@ -0,0 +1,228 @@
+"""Incremental re-crawls of many series.
+
+`CrawlState` stores the `last_updated` and `activity_stats` of every crawled
+series, with its number of users on each list as seen on the bulk listing
+pages (`stats.html`, see `scripts/top_lists.py`). `IncrementalCrawler` uses it
+to populate again only the series that may have changed since the last crawl:
+    - series never crawled, or last crawled more than `max_age` seconds ago,
+    - series on the listing pages whose numbers of users changed (those whose
+      numbers didn't change are skipped without any request),
+    - other series whose `last_updated` changed, according to a probe that
+      reads the series page only up to that section
+      (`populate(fields=['last_updated'], stream=True)`).
+"""
+
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+import json
+import sqlite3
+import threading
+import time
+
+from .series import Series
+
+
+@dataclass
+class CrawlRecord:
+    id: int
+    last_updated: datetime = None
+    activity_stats: dict = None     # `dataclasses.asdict(Series.activity_stats)`
+    listed: dict = field(default_factory=dict)  # {list name: number of users}
+    crawled: float = None   # `time.time()` of the last `populate()`
+
+
+class CrawlState:
+    """`CrawlRecord`s of the crawled series, in the SQLite database `path`
+    (created if needed). Thread-safe.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('CREATE TABLE IF NOT EXISTS series ('
+                         'id INTEGER PRIMARY KEY, last_updated TEXT, '
+                         'activity_stats TEXT, listed TEXT, crawled REAL)')
+
+    def __repr__(self):
+        return f'CrawlState({repr(self.path)})'
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM series').fetchone()[0]
+
+    def close(self):
+        self._db.close()
+
+    def get(self, id):
+        """The `CrawlRecord` of series `id`, or None if it was never crawled"""
+
+        with self._lock:
+            row = self._db.execute('SELECT last_updated, activity_stats, listed, crawled '
+                                   'FROM series WHERE id = ?', (id,)).fetchone()
+        if row is None:
+            return None
+        last_updated, activity_stats, listed, crawled = row
+        return CrawlRecord(id=id,
+                           last_updated=last_updated and datetime.fromisoformat(last_updated),
+                           activity_stats=json.loads(activity_stats),
+                           listed=json.loads(listed), crawled=crawled)
+
+    def put(self, record):
+        with self._lock:
+            self._db.execute('INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?)',
+                             (record.id,
+                              record.last_updated and record.last_updated.isoformat(),
+                              json.dumps(record.activity_stats), json.dumps(record.listed),
+                              record.crawled))
+
+    def update(self, series, listed=None):
+        """Stores what the populated `series` says now (and its numbers of
+        users `listed`, if given)"""
+
+        record = self.get(series.id) or CrawlRecord(series.id)
+        record.last_updated = series.last_updated
+        record.activity_stats = asdict(series.activity_stats)
+        if listed is not None:
+            record.listed.update(listed)
+        record.crawled = time.time()
+        self.put(record)
+
+
+def listed_counts(rows):
+    """`{series id: {list name: number of users}}` from the rows of the bulk
+    listing pages: `(series_id, series_name, num_users, list_name)`, as
+    returned by `scripts/top_lists.py`'s `get_most_listed`"""
+
+    counts = {}
+    for series_id, _, num_users, list_name in rows:
+        counts.setdefault(series_id, {})[list_name] = num_users
+    return counts
+
+
+class IncrementalCrawler:
+    """Populates again only the series that changed since they were stored
+    in `state` (see the module docstring).
+
+    Arguments:
+        - state (CrawlState)
+        - session (requests.Session):
+            Optional. Session shared by the probes and the series. Defaults
+            to None (a `transport.make_session()` is created on the first
+            request).
+        - max_age (float):
+            Optional. Seconds after which a series is populated again even if
+            it seems unchanged. Defaults to 30 days.
+        - **kwargs: `parser`, `identity_map` (see `Series.__init__`).
+
+    Attributes:
+        - skipped, probed (int): Series skipped thanks to the listing pages,
+            and series probed
+    """
+
+    def __init__(self, state, session=None, max_age=30 * 24 * 60 * 60, **kwargs):
+        self.state = state
+        self._session = session
+        self.max_age = max_age
+        self._kwargs = kwargs
+        self.skipped = self.probed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The requests.Session used to load the webpages (created on first use)"""
+
+        if self._session is None:
+            from .transport import make_session
+            self._session = make_session()
+        return self._session
+
+    def probe(self, id):
+        """`last_updated` of series `id`, read from the start of its page only"""
+
+        series = Series(id, session=self.session, **self._kwargs)
+        series.populate(fields=['last_updated'], stream=True)
+        with self._lock:
+            self.probed += 1
+        return series.last_updated
+
+    def changed(self, ids, listed=None, workers=8):
+        """Yields the series ids among `ids` that should be populated again:
+        those decided without a request right away, the others as soon as
+        their probe completes
+
+        Arguments:
+            - ids (iterable of int)
+            - listed (dict):
+                Optional. See `listed_counts`. Defaults to None (every crawled
+                series is probed).
+            - workers (int):
+                Optional. Number of probes sent at once. Defaults to 8.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        def finished(probes, block):
+            """Ids of the completed `probes` that changed (removed from it)"""
+
+            if block:
+                wait(probes, return_when=FIRST_COMPLETED)
+            for future in [future for future in probes if future.done()]:
+                id, last_updated = probes.pop(future)
+                try:
+                    if future.result() != last_updated:
+                        yield id
+                except Exception:   # populating it reports the error
+                    yield id
+
+        listed = listed or {}
+        self.session    # created once, before the threads share it
+        probes = {}     # future: (id, `last_updated` in the state)
+        with ThreadPoolExecutor(workers) as executor:
+            try:
+                for id in ids:
+                    record = self.state.get(id)
+                    if record is None or record.crawled is None \
+                            or time.time() - record.crawled > self.max_age:
+                        yield id
+                    elif id in listed:
+                        if any(record.listed.get(name) != num_users
+                               for name, num_users in listed[id].items()):
+                            yield id
+                        else:
+                            self.skipped += 1
+                    else:
+                        probes[executor.submit(self.probe, id)] = (id, record.last_updated)
+                    # keep every worker busy, and the next probes queued
+                    yield from finished(probes, block=len(probes) >= 2 * workers)
+                while probes:
+                    yield from finished(probes, block=True)
+            finally:
+                for future in probes:
+                    future.cancel()
+
+    def crawl(self, ids, listed=None, workers=8, ordered=False, fields=None, retain_html=True):
+        """Populates the series of `ids` that changed (see `changed()`, whose
+        probes run on `workers` threads too) on a pool of `workers` threads
+        (see `Series.fetch_many`), and stores their new state.
+
+        Arguments:
+            - ids (iterable of int)
+            - listed (dict): Optional. See `changed()`.
+            - workers (int), ordered (bool), fields (iterable of str),
+              retain_html (bool): Optional. See `Series.fetch_many`.
+                `last_updated` and `activity_stats` are always extracted.
+        Yields:
+            - tuple(int, Series or Exception): See `Series.fetch_many`.
+        """
+
+        listed = listed or {}
+        if fields is not None:
+            fields = {*fields, 'last_updated', 'activity_stats'}
+        results = Series.fetch_many(self.changed(ids, listed, workers), workers, ordered,
+                                    session=self.session, fields=fields,
+                                    retain_html=retain_html, **self._kwargs)
+        for id, series in results:
+            if not isinstance(series, Exception):
+                self.state.update(series, listed.get(id))
+            yield id, series
@@ -20,6 +20,13 @@ class UnpopulatedError(Exception):
     def __init__(self):
         super().__init__("Webpage hasn't been loaded yet. Call `.populate()` first.")
 
+class SectionNotLoadedError(UnpopulatedError):
+    """Section of the webpage wasn't downloaded (see `Series.populate(stream=True)`)"""
+
+    def __init__(self, section):
+        Exception.__init__(self, f"Section {repr(section)} wasn't downloaded. "
+                                 "Call `.populate()` with it in `fields` first.")
+
 class IDNotFoundError(Exception):
     """ID not found."""
 
@@ -46,3 +53,12 @@ class InvalidListNameError(Exception):
     """Invalid List Name"""
 
     pass
+
+class CircuitOpenError(Exception):
+    """Requests are stopped after too many consecutive failures (see
+    `retry.CircuitBreaker`)"""
+
+    def __init__(self, retry_in):
+        self.retry_in = retry_in
+        super().__init__(f'The site seems to be down: requests are stopped for '
+                         f'{retry_in:.0f} more seconds.')
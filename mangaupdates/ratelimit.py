@@ -0,0 +1,294 @@
+"""Rate limiting shared by everything that sends requests to the site.
+
+One `RateLimiter` counts the requests of every thread and coroutine that uses
+it. `RateLimitedSession` wraps a `requests.Session` so that every request it
+sends waits for the limiter; pass it as the `session` of `Series` and
+`ListStats` (the series and lists they link to share it), or wrap it in a
+`cache.CachedSession` so that cached pages don't count.
+
+`AdaptiveLimiter` limits the number of requests in flight instead, adjusting
+the limit to how the site responds (AIMD: additive increase while latency is
+stable, multiplicative decrease on 429s, 5xxs and timeouts); `AdaptiveSession`
+applies it to a `requests.Session`.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket: allows `rate` requests per second on average, in bursts
+    of up to `burst` requests. Thread-safe; share one instance between
+    everything that should count against the same limit.
+
+    Arguments:
+        - rate (float): Requests per second
+        - burst (int): Optional. Requests allowed at once. Defaults to 1.
+    """
+
+    def __init__(self, rate, burst=1):
+        if rate <= 0 or burst < 1:
+            raise ValueError(f'rate ({rate}) should be > 0 and burst ({burst}) >= 1')
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'RateLimiter(rate={self.rate}, burst={self.burst})'
+
+    def _reserve(self):
+        """Takes a token, possibly one that is only available later
+
+        Returns:
+            - float: Seconds to wait before using it
+        """
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0, -self._tokens / self.rate)
+
+    def acquire(self):
+        """Blocks until a request may be sent"""
+
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def wait(self):
+        """Waits (without blocking the event loop) until a request may be sent"""
+
+        import asyncio
+
+        delay = self._reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class RateLimitedSession:
+    """`requests.Session` whose requests wait for `limiter` first. Any other
+    attribute is that of `session`.
+
+    Arguments:
+        - limiter (RateLimiter)
+        - session (requests.Session):
+            Optional. Session that sends the requests. Defaults to None (a
+            `transport.make_session()` is created on the first request).
+    """
+
+    # its requests are spaced out: `ListStats.populate()` needs no `delay`
+    spaces_requests = True
+
+    def __init__(self, limiter, session=None):
+        self.limiter = limiter
+        self._session = session
+
+    def __repr__(self):
+        return f'RateLimitedSession({repr(self.limiter)})'
+
+    @property
+    def session(self):
+        if self._session is None:
+            from .transport import make_session
+            self._session = make_session()
+        return self._session
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    def request(self, method, url, **kwargs):
+        self.limiter.acquire()
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, params=None, **kwargs):
+        self.limiter.acquire()
+        return self.session.get(url, params=params, **kwargs)
+
+
+@dataclass
+class LimitChange:
+    time: float     # `time.monotonic()`
+    limit: int
+    reason: str     # 'increase', or what caused a decrease: e.g. '429', 'timeout'
+
+
+class AdaptiveLimiter:
+    """Limits the requests in flight at once to `limit`, which grows by
+    `increase` every `limit` requests that succeed without their latency rising
+    above `latency_tolerance` times its moving average, and is multiplied by
+    `decrease` on congestion (a 429, a 5xx, a timeout). A `Retry-After` also
+    holds back every request until then. Thread-safe.
+
+    Congestion reported by requests sent before the last decrease doesn't
+    decrease the limit again (they were sent under the previous limit).
+
+    Arguments:
+        - initial, min_limit, max_limit (int): Optional. Limits. Default to 1,
+            1 and 16.
+        - increase (float), decrease (float): Optional. Default to 1 and 0.5.
+        - latency_tolerance (float): Optional. Defaults to 2.
+        - history (int): Optional. Number of `changes` kept. Defaults to 100.
+
+    Attributes:
+        - limit (int): Current limit
+        - in_flight (int): Requests currently in flight
+        - changes (deque of LimitChange): Most recent changes of `limit`
+        - latency (float): Moving average of the latency of successful
+            requests, in seconds (or None)
+    """
+
+    def __init__(self, initial=1, min_limit=1, max_limit=16, increase=1, decrease=0.5,
+                 latency_tolerance=2, history=100):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError(f'should be 1 <= min_limit ({min_limit}) <= initial ({initial}) '
+                             f'<= max_limit ({max_limit})')
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.changes = deque(maxlen=history)
+        self.latency = None
+        self.in_flight = 0
+        self._limit = float(initial)
+        self._epoch = 0     # number of decreases
+        self._resume_at = 0     # `time.monotonic()` from Retry-After
+        self._condition = threading.Condition()
+
+    def __repr__(self):
+        return (f'AdaptiveLimiter(limit={self.limit}, min_limit={self.min_limit}, '
+                f'max_limit={self.max_limit})')
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    def acquire(self):
+        """Blocks until a request may be sent
+
+        Returns:
+            - int: Token to pass to `release()`
+        """
+
+        with self._condition:
+            while True:
+                wait = self._resume_at - time.monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                elif self.in_flight < self.limit:
+                    self.in_flight += 1
+                    return self._epoch
+                else:
+                    self._condition.wait()
+
+    def release(self, token, latency=None, congestion=None, retry_after=None):
+        """Reports the outcome of a request sent after `acquire()`
+
+        Arguments:
+            - token (int): Returned by `acquire()`
+            - latency (float): Optional. Seconds it took, if it succeeded.
+            - congestion (str):
+                Optional. What went wrong (e.g. '429', 'timeout'), if the
+                site is overloaded or throttling.
+            - retry_after (float): Optional. Seconds from `Retry-After`.
+        """
+
+        with self._condition:
+            self.in_flight -= 1
+            if congestion is not None:
+                if retry_after:
+                    self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+                if token == self._epoch:
+                    self._epoch += 1
+                    self._set(max(self.min_limit, self._limit * self.decrease), congestion)
+            elif latency is not None:
+                if self.latency is None or latency <= self.latency * self.latency_tolerance:
+                    self._set(min(self.max_limit, self._limit + self.increase / self.limit),
+                              'increase')
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self._condition.notify_all()
+
+    def _set(self, limit, reason):
+        previous = self.limit
+        self._limit = limit
+        if self.limit != previous:
+            self.changes.append(LimitChange(time.monotonic(), self.limit, reason))
+
+
+def retry_after(response):
+    """Seconds from the `Retry-After` header of `response` (or None)"""
+
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class AdaptiveSession:
+    """`requests.Session` whose requests wait for a slot of `limiter` (an
+    `AdaptiveLimiter`), and report back how they went. Any other attribute is
+    that of `session`.
+
+    Arguments:
+        - limiter (AdaptiveLimiter)
+        - session (requests.Session):
+            Optional. Session that sends the requests. Defaults to None (a
+            `transport.make_session()` is created on the first request).
+    """
+
+    def __init__(self, limiter, session=None):
+        self.limiter = limiter
+        self._session = session
+
+    def __repr__(self):
+        return f'AdaptiveSession({repr(self.limiter)})'
+
+    @property
+    def session(self):
+        if self._session is None:
+            from .transport import make_session
+            self._session = make_session()
+        return self._session
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    def get(self, url, params=None, **kwargs):
+        import requests
+
+        token = self.limiter.acquire()
+        start = time.monotonic()
+        try:
+            response = self.session.get(url, params=params, **kwargs)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            self.limiter.release(token, congestion='timeout')
+            raise
+        except BaseException:
+            self.limiter.release(token)
+            raise
+
+        if response.status_code == 429 or response.status_code >= 500:
+            self.limiter.release(token, congestion=str(response.status_code),
+                                 retry_after=retry_after(response))
+        else:
+            self.limiter.release(token, latency=time.monotonic() - start)
+        return response
@@ -0,0 +1,204 @@
+"""Retries and circuit breaking for the requests sent to the site.
+
+`RetrySession` wraps a `requests.Session` so that GETs (which are idempotent)
+that fail with a connection error, a timeout, a 429 or a 5xx are retried after
+an exponential backoff with full jitter (or the `Retry-After` of the response,
+if longer). A `CircuitBreaker` shared by the whole crawl stops every request
+at once, for a growing cooldown, once too many fail in a row (e.g. while the
+site is down), instead of every request sleeping through its own retries.
+"""
+
+from collections import deque
+import random
+import threading
+import time
+
+from mangaupdates import exceptions
+from .ratelimit import retry_after
+
+
+# responses worth retrying
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures: requests then raise
+    `exceptions.CircuitOpenError` right away for `cooldown` seconds. Then a
+    single request is let through (half-open): if it succeeds, the breaker
+    closes again; if it fails, it reopens for twice as long (up to
+    `max_cooldown`). Thread-safe.
+
+    Arguments:
+        - threshold (int): Optional. Defaults to 5.
+        - cooldown, max_cooldown (float): Optional. Seconds. Default to 30 and
+            600.
+        - on_change (callable):
+            Optional. Called with the new state ('open', 'half-open' or
+            'closed') whenever it changes, e.g. to report when requests
+            resume. Defaults to None.
+
+    Attributes:
+        - state (str): 'closed', 'open' or 'half-open'
+        - changes (deque): `(time.monotonic(), state)` of the recent changes
+    """
+
+    def __init__(self, threshold=5, cooldown=30, max_cooldown=600, on_change=None):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.on_change = on_change
+        self.state = 'closed'
+        self.changes = deque(maxlen=100)
+        self._failures = 0
+        self._open_for = cooldown
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f'CircuitBreaker(state={repr(self.state)})'
+
+    def _set(self, state):
+        """Changes the state (called with the lock held)
+
+        Returns:
+            - callable: Reports the change (to call without the lock)
+        """
+
+        self.state = state
+        self.changes.append((time.monotonic(), state))
+        if state == 'open':
+            self._opened_at = time.monotonic()
+        return lambda: self.on_change and self.on_change(state)
+
+    def before(self):
+        """Called before each request
+
+        Raises:
+            - exceptions.CircuitOpenError: If requests are stopped
+        """
+
+        report = None
+        with self._lock:
+            if self.state == 'open':
+                retry_in = self._opened_at + self._open_for - time.monotonic()
+                if retry_in > 0:
+                    raise exceptions.CircuitOpenError(retry_in)
+                report = self._set('half-open')     # this request is the trial
+            elif self.state == 'half-open':     # the trial is in flight
+                raise exceptions.CircuitOpenError(0)
+        if report:
+            report()
+
+    def success(self):
+        report = None
+        with self._lock:
+            self._failures = 0
+            if self.state != 'closed':
+                self._open_for = self.cooldown
+                report = self._set('closed')
+        if report:
+            report()
+
+    def failure(self):
+        report = None
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half-open':
+                self._open_for = min(self.max_cooldown, 2 * self._open_for)
+                report = self._set('open')
+            elif self.state == 'closed' and self._failures >= self.threshold:
+                report = self._set('open')
+        if report:
+            report()
+
+
+def report_breaker(state):
+    """`CircuitBreaker.on_change` that prints when requests stop and resume
+    (e.g. in scripts)"""
+
+    messages = {'open': 'The site seems to be down: requests are stopped.',
+                'half-open': 'Trying again...',
+                'closed': 'The site is back: requests resumed.'}
+    print('\n', messages[state], sep='', flush=True)
+
+
+class RetrySession:
+    """`requests.Session` whose GETs are retried (see the module docstring).
+    Any other attribute is that of `session`.
+
+    After the last retry, the last response (e.g. a 503) is returned, or the
+    last exception raised. Each attempt goes through `session`: wrap a
+    `ratelimit.RateLimitedSession` so that retries take their tokens too.
+
+    Arguments:
+        - session (requests.Session):
+            Optional. Session that sends the requests. Defaults to None (a
+            `transport.make_session()` is created on the first request).
+        - retries (int): Optional. Retries of each request. Defaults to 5.
+        - backoff (float):
+            Optional. Seconds: the n-th retry waits a random time up to
+            `backoff * 2**n` (and at most `max_backoff`). Defaults to 1.
+        - max_backoff (float): Optional. Defaults to 60.
+        - breaker (CircuitBreaker): Optional. Defaults to None.
+    """
+
+    def __init__(self, session=None, retries=5, backoff=1, max_backoff=60, breaker=None):
+        self._session = session
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.breaker = breaker
+
+    def __repr__(self):
+        return f'RetrySession(retries={self.retries}, breaker={repr(self.breaker)})'
+
+    @property
+    def session(self):
+        if self._session is None:
+            from .transport import make_session
+            self._session = make_session()
+        return self._session
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.session, name)
+
+    def get(self, url, params=None, **kwargs):
+        import requests
+
+        for attempt in range(self.retries + 1):
+            if self.breaker is not None:
+                self.breaker.before()
+            wait = 0
+            try:
+                response = self.session.get(url, params=params, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error, response = e, None
+            except BaseException:
+                if self.breaker is not None:
+                    self.breaker.failure()
+                raise
+            else:
+                error = None
+                if response.status_code not in RETRY_STATUSES:
+                    if self.breaker is not None:
+                        self.breaker.success()
+                    return response
+                wait = retry_after(response) or 0
+
+            if self.breaker is not None:
+                if response is not None and response.status_code == 429:
+                    self.breaker.success()  # the site is up
+                else:
+                    self.breaker.failure()
+            if attempt == self.retries:
+                break
+            if response is not None:
+                response.close()
+            time.sleep(max(wait, random.uniform(0, min(self.max_backoff,
+                                                       self.backoff * 2**attempt))))
+
+        if error is not None:
+            raise error
+        return response
@@ -0,0 +1,156 @@
+"""Offset index of the sections of a series page, for `Series.populate(fields=...)`.
+
+Instead of parsing the whole page, the decoded text is scanned once with
+regular expressions for the `sCat` labels. Each section (from its `sCat` to
+the next one) is then parsed on its own, only when it's first needed.
+
+With `populate(stream=True)`, `read_sections` scans the page while it's being
+downloaded and stops as soon as the requested sections are complete.
+"""
+
+from collections.abc import Mapping
+import codecs
+import html
+import re
+
+from mangaupdates import exceptions
+from .utils import SNIFF_SIZE, sniff_encoding
+
+
+_title = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_series_rows = re.compile(r'<!--\s*Start:Series Rows\s*-->')
+_main_content = re.compile(r'<[a-z]+[^>]*\bid\s*=\s*["\']?main_content\b', re.IGNORECASE)
+_sCat = re.compile(r'<div[^>]*\bclass\s*=\s*["\'][^"\']*\bsCat\b[^>]*>\s*<b[^>]*>([^<]*)',
+                   re.IGNORECASE)
+
+
+class SectionIndex(Mapping):
+    """Read-only `{label: sContent}` mapping (like `Series._entries`) whose
+    values are parsed on first access.
+
+    Arguments:
+        - text (str): Decoded series page
+        - backend (module): `mangaupdates.soup` or `mangaupdates.xpath`
+        - complete (bool):
+            Optional. False if `text` is only the beginning of the page (see
+            `read_sections`), in which case its last section is incomplete
+            and is left out. Defaults to True.
+    Raises:
+        - exceptions.InvalidSeriesIDError
+        - exceptions.SeriesIDNotFoundError
+        - exceptions.ParseError: If there is no `#main_content`
+    """
+
+    def __init__(self, text, backend, complete=True):
+        match = _title.search(text)
+        page_title = html.unescape(match.group(1)).strip() if match else ''
+        if page_title == 'Baka-Updates :: Manga :: Info':
+            raise exceptions.InvalidSeriesIDError
+        # see `soup.parse_page`
+        if page_title == 'Baka-Updates Manga - Series' and _series_rows.search(text):
+            raise exceptions.SeriesIDNotFoundError
+
+        match = _main_content.search(text)
+        if not match:
+            raise exceptions.ParseError('Main Content')
+
+        self._text = text
+        self._backend = backend
+        self._parsed = {}
+
+        starts = [(m.start(), html.unescape(m.group(1)).strip())
+                  for m in _sCat.finditer(text, match.start())]
+        ends = [start for start, _ in starts[1:]] + [len(text)]
+        if not complete:    # the last section was cut off
+            starts, ends = starts[:-1], ends[:-1]
+        self._offsets = {key: (start, end) for (start, key), end in zip(starts, ends)}
+        self._header = (match.start(), starts[0][0] if starts else len(text))
+        self._complete = complete
+
+    @property
+    def header(self):
+        """The part of `#main_content` before the first section (has the title)"""
+
+        start, end = self._header
+        return self._backend.parse_fragment(self._text[start:end])
+
+    def parse(self, keys):
+        """Parses the sections labeled `keys` now instead of on first access"""
+
+        for key in keys:
+            if key in self._offsets:
+                self[key]
+
+    def __getitem__(self, key):
+        if key not in self._parsed:
+            if key not in self._offsets and not self._complete:
+                raise exceptions.SectionNotLoadedError(key)
+            start, end = self._offsets[key]
+            fragment = self._backend.parse_fragment(self._text[start:end])
+            self._parsed[key] = self._backend.entries(fragment).get(key)
+        return self._parsed[key]
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+
+def read_sections(response, keys, chunk_size=SNIFF_SIZE):
+    """Reads a series page from a streamed response (`stream=True`) only as far
+    as needed, then closes the connection.
+
+    Reading stops once the title checks of `SectionIndex` can be made and every
+    section labeled in `keys` has been followed by the start of another one
+    (`None` in `keys` stands for the title, which precedes the first section).
+
+    Returns:
+        - tuple(str, bool): The decoded text that was read, and whether it is
+            the whole page
+    """
+
+    wanted = set(keys)
+    chunks = response.iter_content(chunk_size)
+
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_SIZE:
+            break
+    decoder = codecs.getincrementaldecoder(sniff_encoding(head, response.encoding))(errors='replace')
+    text = decoder.decode(head)
+
+    page_title = None
+    found_main_content = False
+    labels = []
+    scan_from = 0
+    while True:
+        if page_title is None:
+            match = _title.search(text)
+            if match:
+                page_title = html.unescape(match.group(1)).strip()
+        if not found_main_content:
+            found_main_content = bool(_main_content.search(text))
+        for match in _sCat.finditer(text, scan_from):
+            if match.end() == len(text):    # the label may continue in the next chunk
+                break
+            labels.append(html.unescape(match.group(1)).strip())
+            scan_from = match.end()
+
+        if page_title == 'Baka-Updates :: Manga :: Info':
+            break
+        if page_title is not None and found_main_content and labels:
+            # the last label's section may still be incomplete
+            if wanted.issubset(labels[:-1] + [None]):
+                break
+        if page_title == 'Baka-Updates Manga - Series' and _series_rows.search(text):
+            break
+
+        chunk = next(chunks, None)
+        if chunk is None:
+            return text + decoder.decode(b'', final=True), True
+        text += decoder.decode(chunk)
+
+    response.close()
+    return text, False
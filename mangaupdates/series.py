@@ -1,21 +1,20 @@
-import requests
-from bs4 import BeautifulSoup, Comment
-import re
+# requests, bs4, lxml and dateutil are imported on first use (on the first
+# request or parse), to keep `import mangaupdates` fast
+import importlib
+import sys
+import threading
 import time
-import json
-import dateutil.parser
 
-from functools import cached_property, partial
+from array import array
+from collections import deque
+from functools import cached_property
 from dataclasses import dataclass, field
 from typing import List, Any
 
 from mangaupdates import exceptions
-from .authors import Author
 from .groups import Group
-from .publishers import Publisher, Magazine
-from .tags import Category
-from .users import UserReview, UserRating
-from .utils import remove_outer_parens, params_from_url, id_from_url
+from .sections import SectionIndex, read_sections
+from .utils import SNIFF_SIZE, decode_chunks, decode_html
 
 
 @dataclass
@@ -66,21 +65,149 @@ class ListEntry:
     rating: int = None
 
 
+NO_RATING = -1.0    # `UserList.ratings` of the entries without a rating
+
+@dataclass
+class UserList:
+    """Entries of a list of a series (see `ListStats`), column by column: user
+    ids, usernames (interned, as they repeat across series) and ratings
+    (`NO_RATING` if none).
+    """
+
+    user_ids: array = field(default_factory=lambda: array('i'))
+    usernames: List[str] = field(default_factory=list)
+    ratings: array = field(default_factory=lambda: array('d'))
+
+    def append(self, user_id, username, rating=None):
+        self.user_ids.append(user_id)
+        self.usernames.append(sys.intern(username))
+        self.ratings.append(NO_RATING if rating is None else rating)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def __iter__(self):
+        """Yields the (user id, username, rating or None) of each entry"""
+
+        for user_id, username, rating in zip(self.user_ids, self.usernames, self.ratings):
+            yield user_id, username, None if rating == NO_RATING else rating
+
+
+_session_lock = threading.Lock()
+
+def _shared_session(obj):
+    """A new `transport.make_session()` for `obj`, or the one in the holder it
+    shares with the series it was linked from (created there if needed)"""
+
+    from .transport import make_session
+    ref = obj._session_ref
+    if ref is None:
+        return make_session()
+    with _session_lock:
+        if ref[0] is None:
+            ref[0] = make_session()
+        return ref[0]
+
+
+class generator_property:
+    """Like `property`, for the `Series` properties that yield their values.
+
+    The values are extracted once, into a tuple kept in the instance's
+    `_generated` dict (reset by `populate()`); each access returns a new
+    iterator over that tuple. `Series.iterate()` yields them straight from the
+    page instead.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return iter(self.values(instance))
+
+    def __set__(self, instance, value):
+        raise AttributeError(f"can't set attribute {repr(self.name)}")
+
+    def values(self, instance):
+        """The cached tuple of values of `instance`"""
+
+        generated = instance.__dict__.setdefault('_generated', {})
+        if self.name not in generated:
+            generated[self.name] = tuple(self.func(instance))
+        return generated[self.name]
+
+
+# `Series(parser=...)` -> module (relative to this package) that parses the page
+PARSERS = {'bs4': '.soup',
+           'lxml': '.xpath'}
+
+# `Series` property -> label of the page section (`_entries` key) it is parsed
+# from, for `Series.populate(fields=...)`. The title is parsed separately.
+SECTIONS = {'title': None,
+            'description': 'Description',
+            'series_type': 'Type',
+            'related_series': 'Related Series',
+            'associated_names': 'Associated Names',
+            'groups_scanlating': 'Groups Scanlating',
+            'latest_releases': 'Latest Release(s)',
+            'status': 'Status',
+            'completely_scanlated': 'Completely Scanlated?',
+            'anime_chapters': 'Anime Start/End Chapter',
+            'user_reviews': 'User Reviews',
+            'forum': 'Forum',
+            'user_rating': 'User Rating',
+            'last_updated': 'Last Updated',
+            'image': 'Image',
+            'genres': 'Genre',
+            'categories': 'Categories',
+            'category_recommendations': 'Category Recommendations',
+            'recommendations': 'Recommendations',
+            'authors': 'Author(s)',
+            'artists': 'Artist(s)',
+            'year': 'Year',
+            'original_publisher': 'Original Publisher',
+            'serialized_in': 'Serialized In (magazine)',
+            'licensed_in_english': 'Licensed (in English)',
+            'english_publisher': 'English Publisher',
+            'activity_stats': 'Activity Stats',
+            'list_stats': 'List Stats'}
+
+
 class Series:
     domain = 'https://www.mangaupdates.com'
+    _session_ref = None    # session holder shared with a linked series, see _share_session()
 
-    def __init__(self, id, session=None, title=None):
+    def __init__(self, id, session=None, title=None, parser='bs4', identity_map=None):
         """Initializes Series object
 
         Arguments:
             - id (int): Series id
             - session (requests.Session):
-                Optional. Session to be used by the Series instance.
-                Defaults to None. If None, a new requests.Session object is used.
+                Optional. Session to be used by the Series instance, and by
+                the `Series` and `ListStats` objects it links to. Defaults to
+                None. If None, a `transport.make_session()` is created on the
+                first request by this series or any of them, and shared by all.
             - title (str):
                 Optional. Title assigned to the series. Defaults to None.
                 Will be overriden by new information provided by the `populate()`
                 method.
+            - parser (str):
+                Optional. Backend used to parse the series webpage: 'bs4'
+                (BeautifulSoup, the default) or 'lxml' (precompiled XPath
+                expressions over an `lxml.html` tree, several times faster).
+                Both produce the same values.
+            - identity_map (dict):
+                Optional. `{id: Series}` shared by every series reached from
+                this one (`related_series`, `recommendations`, ...), so that
+                each series ID resolves to a single `Series` instance (and is
+                populated at most once) across a crawl. This series is added to
+                it, unless its ID is already there. Defaults to None (every
+                link creates a new `Series`).
         Returns
             Series
         """
@@ -89,10 +216,14 @@ class Series:
             raise exceptions.InvalidSeriesIDError(f'id = {id} <= 0 (should be > 0)')
         self.id = id
 
-        if session is None:
-            self._session = requests.Session()
-        else:
-            self._session = session
+        if parser not in PARSERS:
+            raise ValueError(f'parser should be one of {tuple(PARSERS)}, not {repr(parser)}')
+        self._parser = parser
+        self._session = session
+
+        self._identity_map = identity_map
+        if identity_map is not None:
+            identity_map.setdefault(id, self)
 
         if title is not None:
             self.title = title
@@ -106,45 +237,338 @@ class Series:
         else:
             return f'Series(id={self.id})'
 
-    def populate(self):
+    def populate(self, fields=None, stream=False, retain_html=True):
         """Re/loads the series webpage. Needs to be called to access the class
         properties.
+
+        Arguments:
+            - fields (iterable of str):
+                Optional. Names of the properties that will be used (see
+                `SECTIONS`). If given, only the sections of the page behind
+                those properties are parsed instead of the whole page; any other
+                property still works, but its section is parsed on first
+                access. Defaults to None (parse the whole page).
+            - stream (bool):
+                Optional. If True (and `fields` is given), the page is read
+                in chunks while it's downloaded, and the connection is closed
+                as soon as the title checks and the sections of `fields` are
+                complete. The properties of the sections that weren't
+                downloaded raise `exceptions.SectionNotLoadedError`. Use
+                `fields=[]` to only check that the series ID exists.
+                Defaults to False.
+            - retain_html (bool):
+                Optional. If False, `freeze()` is called right away, so that
+                only the extracted values are kept. Defaults to True.
+
+        With a `cache.CachedSession`, if the page is the same as the one
+        loaded by the previous call (with the same `fields`), it isn't parsed
+        again: the values already extracted are kept. This only works when the
+        same instance is populated again (also once frozen or unpickled, as
+        the page's digest is kept): a new `Series` parses the page as usual.
+
+        Raises:
+            - ValueError: If `fields` has an unknown property name
+        """
+
+        fields = self._check_fields(fields)
+        stream = stream and fields is not None
+        response = self.session.get(f'{self.domain}/series.html', params={'id': self.id},
+                                    **({'stream': True} if stream else {}))
+
+        # decode once and parse once: the title checks and `_entries` all work
+        # on the same tree
+        if stream:
+            # released even if it's an error page (or reading it fails)
+            with response:
+                response.raise_for_status()
+                text, complete = read_sections(response, (SECTIONS[name] for name in fields))
+            digest = None
+        else:
+            response.raise_for_status()
+            content = response.content
+            # hash of the body, from a `cache.CachedSession`
+            digest = getattr(response, 'digest', None)
+            if digest is not None and digest == self.__dict__.get('_digest') \
+                    and fields == self._fields:
+                # same page as last time: keep what was extracted from it (and
+                # don't hold on to the response if it was frozen)
+                if not retain_html and '_entries' in self.__dict__:
+                    self.freeze()
+                return
+            text, complete = decode_html(content, response.encoding), True
+        self._response = response
+        self._digest = None
+        self._load(text, fields, complete, retain_html)
+        self._digest = digest
+
+    @classmethod
+    def fetch_many(cls, ids, workers=8, ordered=False, session=None, fields=None,
+                   stream=False, retain_html=True, **kwargs):
+        """Populates the series `ids` on a pool of `workers` threads.
+
+        Arguments:
+            - ids (iterable of int): Series ids (consumed as needed)
+            - workers (int): Optional. Number of threads (and connections).
+                Defaults to 8.
+            - ordered (bool):
+                Optional. If True, results are yielded in the order of `ids`
+                instead of as soon as they're ready. Defaults to False.
+            - session (requests.Session):
+                Optional. Session shared by every series. Defaults to None (a
+                new one from `transport.make_session(workers)`, closed when
+                done).
+            - fields (iterable of str), stream (bool), retain_html (bool):
+                Optional. See `populate()`.
+            - **kwargs: `parser`, `identity_map` (see `__init__`).
+        Yields:
+            - tuple(int, Series or Exception): Each id with its populated
+                series, or the exception raised while fetching or parsing it
+        """
+
+        if session is None:
+            from .transport import make_session
+            with make_session(workers) as session:
+                yield from cls.fetch_many(ids, workers, ordered, session, fields, stream,
+                                          retain_html, **kwargs)
+            return
+
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        def fetch(id):
+            series = cls(id, session=session, **kwargs)
+            series.populate(fields=fields, stream=stream, retain_html=retain_html)
+            return series
+
+        def result(id, future):
+            try:
+                return id, future.result()
+            except Exception as e:
+                return id, e
+
+        ids = iter(ids)
+        pending = deque()   # (id, future), in the order of `ids`
+        with ThreadPoolExecutor(workers) as executor:
+            try:
+                while True:
+                    for id in ids:  # keep every worker busy, and the next ones queued
+                        pending.append((id, executor.submit(fetch, id)))
+                        if len(pending) >= 2 * workers:
+                            break
+                    if not pending:
+                        return
+
+                    if ordered:
+                        id, future = pending.popleft()
+                        yield result(id, future)
+                    else:
+                        wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                        for id, future in [item for item in pending if item[1].done()]:
+                            pending.remove((id, future))
+                            yield result(id, future)
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    @classmethod
+    def from_html(cls, id, content, encoding=None, fields=None, retain_html=True, **kwargs):
+        """Creates a Series from its already downloaded webpage, without any
+        request (e.g. to parse pages from an archive, or in another process
+        than the one that downloads them).
+
+        Arguments:
+            - id (int): Series id
+            - content (bytes or str): The series webpage
+            - encoding (str):
+                Optional. Encoding of `content` (if bytes), e.g. from the HTTP
+                headers. The charset of the page's `<meta>` tag takes
+                precedence. Defaults to None (UTF-8).
+            - fields (iterable of str), retain_html (bool):
+                Optional. See `populate()`.
+            - **kwargs: `session`, `title`, `parser`, `identity_map` (see
+                `__init__`).
+        Returns:
+            Series
+        Raises:
+            - ValueError: If `fields` has an unknown property name
+            - exceptions.InvalidSeriesIDError
+            - exceptions.SeriesIDNotFoundError
+            - exceptions.ParseError: If HTML content is unexpected
         """
 
-        self._response = self._session.get(f'{self.domain}/series.html', params={'id': self.id})
-        self._response.raise_for_status()
+        series = cls(id, **kwargs)
+        fields = series._check_fields(fields)
+        if isinstance(content, bytes):
+            content = decode_html(content, encoding)
+        series._load(content, fields, True, retain_html)
+        return series
+
+    @staticmethod
+    def _check_fields(fields):
+        """`fields` as a tuple (or None)
 
-        soup = BeautifulSoup(self._response.text, 'lxml')
-        if soup.title.get_text(strip=True) == 'Baka-Updates :: Manga :: Info':
-            raise exceptions.InvalidSeriesIDError
+        Raises:
+            - ValueError: If `fields` has an unknown property name
+        """
 
-        # check if given series ID exists or redirected to list
-        # happens when id = 0 (it raises an exception from __init__), but idk
-        # if it happens with id > 0, so I'll keep it in
-        if soup.title.get_text(strip=True) == 'Baka-Updates Manga - Series':
-            # make sure (in case series name is "Series")
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                if 'Start:Series Rows' == comment.strip():
-                    raise exceptions.SeriesIDNotFoundError
+        if fields is not None:
+            fields = tuple(fields)
+            unknown = set(fields).difference(SECTIONS)
+            if unknown:
+                raise ValueError(f'Unknown fields: {sorted(unknown)}')
+        return fields
 
-        self._main_content = BeautifulSoup(self._response.content, 'html.parser').find(id='main_content')
+    def _load(self, text, fields, complete, retain_html):
+        """Parses the decoded webpage `text` (see `populate()`)"""
 
-        _ = self._entries
+        if fields is None:
+            self._main_content = self._backend.parse_page(text)
+            sections = None
+        else:
+            sections = SectionIndex(text, self._backend, complete=complete)
+            self._main_content = sections.header
 
         # delete cache
         cached = ('activity_stats', 'anime_chapters',
-                  'completely_scanlated', 'description', 'entries', 'forum',
+                  'completely_scanlated', 'description', '_entries', 'forum',
                   'image', 'last_updated', 'licensed_in_english', 'list_stats',
                   'original_publisher', 'series_type', 'status', 'title',
-                  'user_rating', 'year')
+                  'user_rating', 'year', '_generated')
         for key in cached:
             if key in self.__dict__:
                 del self.__dict__[key]
-        # no longer cached (generators):
-        # 'related_series', 'groups_scanlating', 'latest_releases',
-        # 'user_reviews', 'genre', 'categories', 'category_recommendations'
-        # 'recommendations', 'authors', 'artists', 'serialized_in',
-        # 'english_publisher'
+        if sections is None:
+            _ = self._entries
+        else:
+            sections.parse(SECTIONS[name] for name in fields)
+            self._entries = sections
+        self._fields = fields
+        # '_generated' holds the tuples of the `generator_property`s:
+        # 'related_series', 'associated_names', 'groups_scanlating',
+        # 'latest_releases', 'user_reviews', 'genres', 'categories',
+        # 'category_recommendations', 'recommendations', 'authors', 'artists',
+        # 'serialized_in', 'english_publisher'
+
+        if not retain_html:
+            self.freeze()
+
+    def freeze(self):
+        """Extracts every property now (only those in `fields`, if given to
+        `populate()`), then releases the response and the parsed webpage.
+
+        Every extracted property (and `json()`) keeps working, without holding
+        on to the HTML. Calling `populate()` again reloads the webpage as usual.
+
+        Raises:
+            - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
+            - exceptions.RegexParseError: If HTML content is unexpected
+            - exceptions.ParseError: If HTML content is unexpected
+        """
+
+        if '_entries' not in self.__dict__:
+            raise exceptions.UnpopulatedError
+
+        self._extract()
+        for key in ('_response', '_main_content', '_entries'):
+            self.__dict__.pop(key, None)
+
+    def _extract(self):
+        """Extracts every property (only those in `fields`, if given to
+        `populate()`); each one keeps its value afterwards"""
+
+        for name in SECTIONS if self._fields is None else self._fields:
+            getattr(self, name)
+
+    def __getstate__(self):
+        """Pickles the extracted values only, like `freeze()` (without
+        freezing this instance): the properties are extracted first, then the
+        response, the parsed webpage, the session and the identity map are left
+        out."""
+
+        if '_entries' in self.__dict__:
+            self._extract()
+        state = self.__dict__.copy()
+        for key in ('_response', '_main_content', '_entries', '_session', '_session_ref',
+                    '_identity_map'):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._session = None
+        self._identity_map = None
+
+    def iterate(self, name):
+        """Yields the values of the generator property `name` (e.g. 'genres')
+        lazily, straight from the page, without caching them.
+
+        Once the values are cached (or the series is frozen), iterates over the
+        cache instead.
+
+        Arguments:
+            - name (str): Name of a property that yields its values
+        Raises:
+            - ValueError: If `name` isn't such a property
+            - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
+        """
+
+        prop = getattr(type(self), name, None)
+        if not isinstance(prop, generator_property):
+            raise ValueError(f'Not a generator property: {repr(name)}')
+        generated = self.__dict__.get('_generated', {})
+        if name in generated:
+            return iter(generated[name])
+        return prop.func(self)
+
+    @property
+    def _backend(self):
+        """Module that extracts the fields (see `PARSERS`)"""
+
+        return importlib.import_module(PARSERS[self._parser], __package__)
+
+    def _entry(self, key):
+        """The section of the page labeled `key` (see `_entries`)
+
+        Raises:
+            - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
+        """
+
+        if '_entries' not in self.__dict__:
+            raise exceptions.UnpopulatedError
+        return self._entries[key]
+
+    @property
+    def session(self):
+        """The requests.Session used to load the webpage (created on first use)"""
+
+        if self._session is None:
+            self._session = _shared_session(self)
+        return self._session
+
+    def _child(self, id, title=None):
+        """Series linked from this series' page, sharing its session (and its
+        identity map, if any)"""
+
+        if self._identity_map is not None and id in self._identity_map:
+            return self._identity_map[id]
+        return self._share_session(type(self)(id, session=self._session, title=title,
+                                              parser=self._parser,
+                                              identity_map=self._identity_map))
+
+    def _child_list_stats(self, **totals):
+        """ListStats of this series, sharing its session"""
+
+        return self._share_session(ListStats(self.id, session=self._session,
+                                             parser=self._parser, **totals))
+
+    def _share_session(self, child):
+        """Makes `child` share this series' session even if there isn't one
+        yet: the first of them to need it creates it for all"""
+
+        if self._session is None:
+            if self._session_ref is None:
+                self._session_ref = [None]
+            child._session_ref = self._session_ref
+        return child
 
     @cached_property
     def title(self):
@@ -158,13 +582,11 @@ class Series:
         """
 
         try:
-            span = self._main_content.find('span', class_='releasestitle tabletitle')
+            main_content = self._main_content
         except AttributeError:
             raise exceptions.UnpopulatedError
 
-        if span is None:
-            raise exceptions.ParseError('Title')
-        return span.get_text(strip=True)
+        return self._backend.title(main_content)
 
     @cached_property
     def description(self):
@@ -179,42 +601,28 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        try:
-            description_ = self._main_content.find(id='div_desc_link') or self._entries['Description']
-        except AttributeError:
-            raise exceptions.UnpopulatedError
-
-        string = description_.get_text(strip=True)
-        if string == 'N/A':
-            return None
-        else:
-            return string
+        return self._backend.description(self._entry('Description'))
 
     @cached_property
     def _entries(self):
         """Snippets of HTML to be parsed by the property methods.
 
         Returns:
-            - dict[key] = bs4.element.Tag:
+            - dict[key] = bs4.element.Tag (or lxml.html.HtmlElement):
                 A dict of html tags from which the properties will be parsed.
                 The keys are the bold text inside the HTML elements with
-                `class="sCat"`
+                `class="sCat"`. After `populate(fields=...)` this is a
+                `sections.SectionIndex` instead, which parses each tag lazily.
         Raises:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
         try:
-            sCats = self._main_content.find_all('div', class_='sCat')
+            main_content = self._main_content
         except AttributeError:
             raise exceptions.UnpopulatedError
 
-        entries = {}
-        for sCat in sCats:
-            if sCat.b:
-                key = next(sCat.b.children).strip() # to avoid <b>Name <div>something else</div></b>
-                                                    # see Status/Status in Country of Origin
-                entries[key] = sCat.find_next_sibling('div', class_='sContent')
-        return entries
+        return self._backend.entries(main_content)
 
     @cached_property
     def series_type(self):
@@ -226,12 +634,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        return self._entries['Type'].get_text(strip=True)
+        return self._backend.series_type(self._entry('Type'))
 
-    @property
+    @generator_property
     def related_series(self):
         """Series related to this series (Spin-offs, etc.)
 
@@ -246,18 +651,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        a_tags = self._entries['Related Series'].find_all('a', href=True)
-        for a in a_tags:
-            title = a.get_text(strip=True)
-            series_id = id_from_url(a['href'])
-            relation = remove_outer_parens(a.next_sibling)
-            yield RelatedSeries(series=Series(series_id, title=title),
-                                relation=relation)
+        return self._backend.related_series(self._entry('Related Series'), self._child)
 
-    @property
+    @generator_property
     def associated_names(self):
         """Other/associated names of the series
 
@@ -267,12 +663,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        return (name for name in self._entries['Associated Names'].stripped_strings)
+        return self._backend.associated_names(self._entry('Associated Names'))
 
-    @property
+    @generator_property
     def groups_scanlating(self):
         """Other/associated names of the series
 
@@ -285,19 +678,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        a_tags = self._entries['Groups Scanlating'].find_all('a', href=True)
-        for a in a_tags:
-            if a['href'].startswith('javascript'):  # skip 'More...' and 'Less...'
-                continue
-            group = Group(name=a.get_text(strip=True))
-            if a.has_attr('title') and (a['title'] == 'Group Info'):
-                group.id = id_from_url(a['href'])
-            yield group
+        return self._backend.groups_scanlating(self._entry('Groups Scanlating'))
 
-    @property
+    @generator_property
     def latest_releases(self):
         """Latest releases of the series
 
@@ -315,27 +698,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        elements = list(self._entries['Latest Release(s)'].children)
-        release = Release(self.id)
-        for element_index in range(len(elements)):
-            element = elements[element_index]
-            if element == 'v.':
-                release.volume = elements[element_index + 1].get_text(strip=True)
-            elif element == 'c.':
-                release.chapter = elements[element_index + 1].get_text(strip=True)
-            elif element.name == 'a' and element.has_attr('title') and element['title'] == 'Group Info':
-                release.groups.append(Group(name=element.get_text(strip=True),
-                                            id=id_from_url(element['href'])))
-            elif element.previous_element.name is None and element.previous_element.strip() == 'by':
-                release.groups.append(Group(name=element.get_text(strip=True)))
-            elif element.name == 'span':
-                release.elapsed = element.get_text(strip=True)
-            elif element.name == 'br':
-                yield release
-                release = Release(self.id)  # at last iteration release is not used
+        return self._backend.latest_releases(self._entry('Latest Release(s)'), self.id)
 
     @cached_property
     def status(self):
@@ -347,10 +710,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        return self._entries['Status'].get_text(strip=True)
+        return self._backend.status(self._entry('Status'))
 
     @cached_property
     def completely_scanlated(self):
@@ -363,16 +723,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        val = self._entries['Completely Scanlated?'].get_text(strip=True)
-        if val == 'Yes':
-            return True
-        elif val == 'No':
-            return False
-        else:
-            return None
+        return self._backend.completely_scanlated(self._entry('Completely Scanlated?'))
 
     @cached_property
     def anime_chapters(self):
@@ -385,16 +736,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        strings = list(self._entries['Anime Start/End Chapter'].stripped_strings)
-        if len(strings) == 1 and strings[0] == 'N/A':
-            return None
-        else:
-            return strings
+        return self._backend.anime_chapters(self._entry('Anime Start/End Chapter'))
 
-    @property
+    @generator_property
     def user_reviews(self):
         """User Reviews of the series
 
@@ -407,15 +751,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        a_tags = self._entries['User Reviews'].find_all('a', href=True)
-        for a in a_tags:
-            review_id = id_from_url(a['href'])
-            review_name = a.get_text(strip=True)
-            reviewer = a.next_sibling.strip()[3:]   # remove 'by ' from 'by User'
-            yield UserReview(review_id, review_name, reviewer)
+        return self._backend.user_reviews(self._entry('User Reviews'))
 
     @cached_property
     def forum(self):
@@ -432,25 +768,7 @@ class Series:
             - exceptions.ParseError: If HTML content is unexpected
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        string = next(self._entries['Forum'].stripped_strings)
-
-        pattern = r'(\d+) topics, (\d+) posts'
-        matches = re.search(pattern, string, re.IGNORECASE)
-        if not matches:
-            raise exceptions.RegexParseError(pattern=pattern, string=string)
-        topics = int(matches.group(1))
-        posts = int(matches.group(2))
-
-        # extract forum id
-        params = params_from_url(self._entries['Forum'].a['href'])
-        if 'fid' not in params:
-            raise exceptions.ParseError("Forum ('fid')")
-        fid = int(params['fid'][0])
-
-        return ForumStats(fid, topics, posts)
+        return self._backend.forum(self._entry('Forum'))
 
     @cached_property
     def user_rating(self):
@@ -469,51 +787,7 @@ class Series:
             - exceptions.ParseError: If HTML content is unexpected
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        div = self._entries['User Rating']
-        if div.get_text(strip=True) == 'N/A':
-            return None
-
-        string = div.next_element.strip()
-        pattern = r'Average: (\d+\.?\d*)'
-        matches = re.search(pattern, string, re.IGNORECASE)
-        if not matches:
-            raise exceptions.RegexParseError(pattern, string)
-        average = float(matches.group(1))
-
-        span = div.find('span')
-        if span and span.next_sibling and span.next_sibling.name is None:
-            string = span.next_sibling.strip()
-            pattern = r'(\d+) votes'
-            matches = re.search(pattern, string, re.IGNORECASE)
-            if not matches:
-                raise exceptions.RegexParseError(pattern=pattern, string=string)
-            votes = int(matches.group(1))
-        else:
-            raise exceptions.ParseError('User Rating (Votes)')
-
-        b = div.find('b')
-        if b:
-            string = b.get_text(strip=True)
-            pattern = r'\d+\.?\d*'
-            matches = re.search(pattern, string, re.IGNORECASE)
-            if not matches:
-                raise exceptions.RegexParseError(pattern=pattern, string=string)
-            bayesian_average = float(matches.group(0))
-        else:
-            raise exceptions.ParseError('User Rating (Bayesian Average)')
-
-        histogram = div.find_all('div', class_='row no-gutters')
-        distribution = {}
-        for bin in histogram:
-            if bin.div:
-                key = bin.div.get_text(strip=True)
-                val = next(bin.find('div', class_='text-right').stripped_strings)
-                distribution[key] = val
-
-        return UserRating(average, bayesian_average, votes, distribution)
+        return self._backend.user_rating(self._entry('User Rating'))
 
     @cached_property
     def last_updated(self):
@@ -526,14 +800,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        updated = self._entries['Last Updated'].get_text(strip=True)
-        if updated == 'N/A':
-            return None
-        else:
-            return dateutil.parser.parse(updated)
+        return self._backend.last_updated(self._entry('Last Updated'))
 
     @cached_property
     def image(self):
@@ -546,16 +813,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        img = self._entries['Image'].img
-        if img and img.has_attr('src'):
-            return img['src']
-        else:
-            return None
+        return self._backend.image(self._entry('Image'))
 
-    @property
+    @generator_property
     def genres(self):
         """Genres of the series
 
@@ -565,13 +825,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
+        return self._backend.genres(self._entry('Genre'))
 
-        for u in self._entries['Genre'].select('a > u'):
-            yield u.get_text(strip=True)
-
-    @property
+    @generator_property
     def categories(self):
         """Categories of the series
 
@@ -586,24 +842,9 @@ class Series:
             - exceptions.RegexParseError: If HTML content is unexpected
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        score_pattern = re.compile(r'Score: (-?\d+) \((\d+),(\d+)\)', re.IGNORECASE)
-        for a in self._entries['Categories'].select('li > a[title]'):
-            string = a['title']
-            matches = re.search(score_pattern, string)
-            if not matches:
-                raise exceptions.RegexParseError(pattern=score_pattern.pattern, string=string)
+        return self._backend.categories(self._entry('Categories'))
 
-            score = int(matches.group(1))   # agree - disagree
-            agree = int(matches.group(2))
-            disagree = int(matches.group(3))
-            name = a.get_text(strip=True)
-
-            yield Category(name, score, agree, disagree)
-
-    @property
+    @generator_property
     def category_recommendations(self):
         """Series recommendations (based on category)
 
@@ -615,15 +856,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        for a in self._entries['Category Recommendations'].find_all('a', href=True):
-            series_id = id_from_url(a['href'])
-            series_name = a.get_text(strip=True)
-            yield Series(series_id, title=series_name)
+        return self._backend.category_recommendations(self._entry('Category Recommendations'), self._child)
 
-    @property
+    @generator_property
     def recommendations(self):
         """Series recommendations
 
@@ -635,47 +870,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        divs = self._entries['Recommendations'].select('#div_recom_more > div')
-        if not divs:
-            return
+        return self._backend.recommendations(self._entry('Recommendations'), self._child)
 
-        # get measure of intensity of the last recommendation
-        try:
-            base_color = divs[-1]['style'].split(':')[1][1:]
-            rgb = base_color[:2], base_color[2:4], base_color[4:]
-            base_intensity = sum(map(partial(int, base=16), rgb))
-        except (KeyError, IndexError):
-            base_intensity = None
-
-        for div in divs:
-            level = None
-            if base_intensity:
-                try:
-                    # get color of entry, remove leading '#'
-                    color = div['style'].split(':')[1][1:]  # hex string
-
-                    # lower intensity = darker shade <-> better recommendation
-                    intensity = sum(map(partial(int, base=16), (color[:2], color[2:4], color[4:])))
-
-                    # base color = lightest shade <-> minimum bar for recommendation
-                    # set base color as 0
-                    level = base_intensity - intensity
-                except (KeyError, IndexError):
-                    pass
-
-            a = div.a
-            series_id = id_from_url(a['href'])
-            if series_id is None:
-                raise exceptions.ParseError('Recommendations (Series ID)')
-            series_name = a.get_text(strip=True)
-            series = Series(series_id, title=series_name)
-
-            yield RecommendedSeries(series=series, level=level)
-
-    @property
+    @generator_property
     def authors(self):
         """Authors of the series
 
@@ -687,14 +884,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        for a in self._entries['Author(s)'].find_all('a', href=True):
-            yield Author(id=id_from_url(a['href']),
-                         name=a.get_text(strip=True))
+        return self._backend.authors(self._entry('Author(s)'))
 
-    @property
+    @generator_property
     def artists(self):
         """Artists of the series
 
@@ -706,12 +898,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        for a in self._entries['Artist(s)'].find_all('a', href=True):
-            yield Author(id=id_from_url(a['href']),
-                         name=a.get_text(strip=True))
+        return self._backend.artists(self._entry('Artist(s)'))
 
     @cached_property
     def year(self):
@@ -724,14 +911,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        yr = self._entries['Year'].get_text(strip=True)
-        if yr == 'N/A':
-            return None
-        else:
-            return yr   # not int because of id=118731 (yr='2019-2020')
+        return self._backend.year(self._entry('Year'))
 
     @cached_property
     def original_publisher(self):
@@ -746,23 +926,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
+        return self._backend.original_publisher(self._entry('Original Publisher'))
 
-        a = self._entries['Original Publisher'].a
-        if a:
-            publisher_id = id_from_url(a.get('href'))
-            if a.has_attr('title') and a['title'] == 'Publisher Info':
-                publisher_name = a.get_text(strip=True)
-            elif a.get_text(strip=True) == 'Add':
-                publisher_name = a.parent.get_text(strip=True)[:-len('\xa0[Add]')]
-            else:
-                raise exceptions.ParseError('Original Publisher (Name)')
-            return Publisher(publisher_name, publisher_id)
-        else:
-            return None
-
-    @property
+    @generator_property
     def serialized_in(self):
         """Magazines in which the series was serialized
 
@@ -775,15 +941,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        for a in self._entries['Serialized In (magazine)'].find_all('a', href=True):
-            magazine = Magazine(url=f"{self.domain}/{a['href']}",
-                                name=a.get_text(strip=True))
-            if a.next_sibling and a.next_sibling.name is None:
-                magazine.parent = remove_outer_parens(a.next_sibling)
-            yield magazine
+        return self._backend.serialized_in(self._entry('Serialized In (magazine)'), self.domain)
 
     @cached_property
     def licensed_in_english(self):
@@ -796,18 +954,9 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        val = self._entries['Licensed (in English)'].get_text(strip=True)
-        if val == 'Yes':
-            return True
-        elif val == 'No':
-            return False
-        else:
-            return None
+        return self._backend.licensed_in_english(self._entry('Licensed (in English)'))
 
-    @property
+    @generator_property
     def english_publisher(self):
         """English Publisher
 
@@ -820,15 +969,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        for a in self._entries['English Publisher'].find_all('a', href=True):
-            publisher = Publisher(id=id_from_url(a['href']),
-                                  name=a.get_text(strip=True))
-            if a.next_sibling and a.next_sibling.name is None:
-                publisher.note = remove_outer_parens(a.next_sibling)
-            yield publisher
+        return self._backend.english_publisher(self._entry('English Publisher'))
 
     @cached_property
     def activity_stats(self):
@@ -847,34 +988,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        a_tags = self._entries['Activity Stats'].find_all('a', href=True)
-        stats = ActivityStats()
-        for a in a_tags:
-            interval = a.get_text(strip=True)
-            b = a.find_next_sibling('b')
-            if not b:
-                raise exceptions.ParseError('Activity Stats (Position)')
-            position = int(b.get_text(strip=True))
-            rank = Rank(position)
-
-            img = a.find_next_sibling('img')
-            if img and img.next_sibling and img.next_sibling.name is None:
-                rank.change = int(remove_outer_parens(img.next_sibling))
-
-            if interval == 'Weekly':
-                stats.weekly = rank
-            elif interval == 'Monthly':
-                stats.monthly = rank
-            elif interval == '3 Month':
-                stats.quarterly = rank
-            elif interval == '6 Month':
-                stats.semiannual = rank
-            elif interval == 'Year':
-                stats.yearly = rank
-        return stats
+        return self._backend.activity_stats(self._entry('Activity Stats'))
 
     @cached_property
     def list_stats(self):
@@ -891,19 +1005,7 @@ class Series:
             - exceptions.UnpopulatedError: If `.populate()` hasn't been called yet
         """
 
-        if '_entries' not in self.__dict__:
-            raise exceptions.UnpopulatedError
-
-        stats = {}
-        for b in self._entries['List Stats'].find_all('b'):
-            num_users = int(b.get_text(strip=True))
-            if b.next_sibling and b.next_sibling.name is None:
-                list_name = b.next_sibling.strip()
-            else:
-                raise exceptions.ParseError('List Stats (List Name)')
-            key = ''.join((list_name[:-len(' lists')], '_total'))
-            stats[key] = num_users
-        return ListStats(self.id, **stats)
+        return self._backend.list_stats(self._entry('List Stats'), self._child_list_stats)
 
     def json(self):
         """Export Series object as json
@@ -933,7 +1035,7 @@ class Series:
                 'genres': list(self.genres),
                 'categories': [category.__dict__ for category in self.categories],
                 'authors': [author.__dict__ for author in self.authors],
-                'artists': [artist.__dict__ for artist in self.authors],
+                'artists': [artist.__dict__ for artist in self.artists],
                 'year': self.year,
                 'original_publisher': self.original_publisher.__dict__ if self.original_publisher else None,
                 'serialized_in': [magazine.__dict__ for magazine in self.serialized_in],
@@ -979,17 +1081,25 @@ class Series:
                               'custom_total': self.list_stats.custom_total,
                              }
 
+        import json
         return json.dumps(data)
 
 class ListStats:
-    def __init__(self, id, session=None, **kwargs):
+    domain = 'https://www.mangaupdates.com'
+    _session_ref = None    # session holder shared with a linked series, see _share_session()
+
+    def __init__(self, id, session=None, parser='bs4', **kwargs):
         """Initializes ListStats object
 
         Arguments:
             - id (int): Series id
             - session (requests.Session):
-                Optional. Session to be used by the Series instance.
-                Defaults to None. If None, a new requests.Session object is used.
+                Optional. Session to be used by the ListStats instance.
+                Defaults to None. If None, a `transport.make_session()` is
+                created on the first request.
+            - parser (str):
+                Optional. Backend used to parse the list webpages: 'bs4' (the
+                default) or 'lxml' (much faster on long lists). See `Series`.
             - reading_total/wish_total/unfinished_total/custom_total (int):
                 Optional. Number of users who added the series on the
                 corresponding list. Used by Series object.
@@ -998,13 +1108,12 @@ class ListStats:
         """
 
         self.id = id
+        self._session = session
 
-        if session is None:
-            self._session = requests.Session()
-        else:
-            self._session = session
-
-        self._soups = {}
+        if parser not in PARSERS:
+            raise ValueError(f'parser should be one of {tuple(PARSERS)}, not {repr(parser)}')
+        self._parser = parser
+        self._lists = {}    # {list name: UserList}
 
         self.reading_total = kwargs.get('reading_total')
         self.wish_total = kwargs.get('wish_total')
@@ -1019,30 +1128,119 @@ class ListStats:
         else:
             return f'ListStats(id={self.id})'
 
-    def populate(self, delay=2, list_names=None):
+    @property
+    def _backend(self):
+        """Module that parses the list webpages (see `PARSERS`)"""
+
+        return importlib.import_module(PARSERS[self._parser], __package__)
+
+    @property
+    def session(self):
+        """The requests.Session used to load the webpages (created on first use)"""
+
+        if self._session is None:
+            self._session = _shared_session(self)
+        return self._session
+
+    def populate(self, delay=2, list_names=None, concurrent=False, limiter=None):
         """Re/loads the various List webpages for the series.
+
+        Arguments:
+            - delay (float):
+                Optional. Seconds to wait between requests (unless
+                `concurrent`, or the session is a
+                `ratelimit.RateLimitedSession`). Defaults to 2.
+            - list_names (iterable of str):
+                Optional. Lists to load. Defaults to None (all of them).
+            - concurrent (bool):
+                Optional. If True, every list is requested at once (on its own
+                thread), so that loading takes about as long as the slowest
+                list. Defaults to False.
+            - limiter (RateLimiter):
+                Optional. Limits the rate of the requests (e.g. shared by many
+                ListStats). Defaults to None.
+        Raises:
+            - exceptions.InvalidListNameError
         """
 
         # https://www.mangaupdates.com/series.html?act=list&list=read&sid=33
         if list_names is None:
             list_names = ('read', 'wish', 'unfinished', 'complete', 'hold')
 
-        url = 'https://www.mangaupdates.com/series.html'
-        params = {'act': 'list',
-                  'sid': self.id}
+        url = f'{self.domain}/series.html'
 
-        for i, list_name in enumerate(list_names):
-            params['list'] = list_name
-            response = self._session.get(url, params=params)
+        def fetch(list_name):
+            if limiter is not None:
+                limiter.acquire()
+            response = self.session.get(url, params={'act': 'list', 'sid': self.id,
+                                                     'list': list_name})
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'lxml')
-            if soup.head.title.get_text(strip=True) == 'Baka-Updates :: Manga :: Info':
-                raise exceptions.InvalidListNameError(repr(list_name), 'is an invalid list name.')
-            self._soups[list_name] = soup
+            return response.content, response.encoding
+
+        if concurrent:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.session    # created before the threads use it
+            with ThreadPoolExecutor(len(list_names) or 1) as executor:
+                futures = [executor.submit(fetch, list_name) for list_name in list_names]
+                for list_name, future in zip(list_names, futures):
+                    self._load(list_name, *future.result())
+            return
+
+        # a rate-limited session already spaces out the requests (an
+        # `AdaptiveSession` only caps how many are in flight)
+        if getattr(self.session, 'spaces_requests', False):
+            delay = 0
+
+        for i, list_name in enumerate(list_names):
+            self._load(list_name, *fetch(list_name))
 
-            if i+1 < len(list_names):
+            if i+1 < len(list_names) and delay:
                 time.sleep(delay)
 
+    @classmethod
+    def from_html(cls, id, pages, encoding=None, **kwargs):
+        """Creates a ListStats from its already downloaded list webpages,
+        without any request.
+
+        Arguments:
+            - id (int): Series id
+            - pages (dict): `{list name: webpage (bytes or str)}`, e.g.
+                `{'read': ..., 'wish': ...}` (see `populate()`)
+            - encoding (str):
+                Optional. Encoding of the pages that are bytes. Defaults to
+                None (the charset of the page's `<meta>` tag, or UTF-8).
+            - **kwargs: See `__init__`.
+        Returns:
+            ListStats
+        Raises:
+            - exceptions.InvalidListNameError
+        """
+
+        list_stats = cls(id, **kwargs)
+        for list_name, content in pages.items():
+            list_stats._load(list_name, content, encoding)
+        return list_stats
+
+    def _load(self, list_name, content, encoding=None):
+        """Parses the webpage of the list `list_name`"""
+
+        if isinstance(content, bytes):
+            content = decode_html(content, encoding)
+        page = self._backend.parse_list_page(content, list_name)
+        entries = UserList()
+        for user_id, username, rating in self._backend.list_entries(page, list_name):
+            entries.append(user_id, username, rating)
+        self._lists[list_name] = entries    # the parsed page is dropped here
+
+    def __getstate__(self):
+        """Leaves out the session when pickled"""
+
+        state = self.__dict__.copy()
+        state['_session'] = None
+        state.pop('_session_ref', None)
+        return state
+
     def general_list(self, list_name):
         """Users who have added the series to their list specified by `list_name`
 
@@ -1055,21 +1253,38 @@ class ListStats:
             - None: If there are no entries
         """
 
-        rows = self._soups[list_name].p.find_next_sibling('p')
-        if not rows:
-            return
+        for user_id, username, rating in self._lists[list_name]:
+            yield ListEntry(series_id=self.id, user_id=user_id, username=username, rating=rating)
 
-        prefix = 'javascript:loadUser(' # for extracting the user id
-        suffix = f',"{list_name}")'
-        for a in rows.find_all('a', recursive=False, href=True):
-            username = a.get_text(strip=True)
-            user_id = int(a['href'][len(prefix):-len(suffix)])
-            entry = ListEntry(series_id=self.id, user_id=user_id, username=username)
+    def stream_list(self, list_name, chunk_size=SNIFF_SIZE, limiter=None):
+        """Downloads and parses the list `list_name` at the same time, without
+        storing it (see `general_list()`). The webpage is read in chunks of
+        `chunk_size` bytes, and each entry is yielded as soon as it's parsed,
+        so that memory doesn't grow with the length of the list. Always uses
+        the lxml parser.
 
-            if a.next_sibling == ' - Rating: ':
-                entry.rating = float(a.find_next_sibling('b').get_text(strip=True))
+        Arguments:
+            - list_name (str): e.g. 'read' (see `populate()`)
+            - chunk_size (int): Optional. Defaults to `utils.SNIFF_SIZE`.
+            - limiter (RateLimiter): Optional. See `populate()`.
+        Yields:
+            - ListEntry
+        Raises:
+            - exceptions.InvalidListNameError
+        """
+
+        from .xpath import iter_list_entries
 
-            yield entry
+        if limiter is not None:
+            limiter.acquire()
+        response = self.session.get(f'{self.domain}/series.html', stream=True,
+                                    params={'act': 'list', 'sid': self.id, 'list': list_name})
+        with response:
+            response.raise_for_status()
+            chunks = decode_chunks(response.iter_content(chunk_size), response.encoding)
+            for user_id, username, rating in iter_list_entries(chunks, list_name):
+                yield ListEntry(series_id=self.id, user_id=user_id, username=username,
+                                rating=rating)
 
     @property
     def reading(self):
@@ -1084,7 +1299,7 @@ class ListStats:
             - None: If there are no entries
         """
 
-        if 'read' not in self._soups:
+        if 'read' not in self._lists:
             raise exceptions.UnpopulatedError
 
         return self.general_list('read')
@@ -1102,7 +1317,7 @@ class ListStats:
             - None: If there are no entries
         """
 
-        if 'wish' not in self._soups:
+        if 'wish' not in self._lists:
             raise exceptions.UnpopulatedError
 
         return self.general_list('wish')
@@ -1120,7 +1335,7 @@ class ListStats:
             - None: If there are no entries
         """
 
-        if 'unfinished' not in self._soups:
+        if 'unfinished' not in self._lists:
             raise exceptions.UnpopulatedError
 
         return self.general_list('unfinished')
@@ -1138,7 +1353,7 @@ class ListStats:
             - None: If there are no entries
         """
 
-        if 'complete' not in self._soups:
+        if 'complete' not in self._lists:
             raise exceptions.UnpopulatedError
 
         return self.general_list('complete')
@@ -1156,7 +1371,7 @@ class ListStats:
             - None: If there are no entries
         """
 
-        if 'hold' not in self._soups:
+        if 'hold' not in self._lists:
             raise exceptions.UnpopulatedError
 
         return self.general_list('hold')
@@ -1168,13 +1383,12 @@ class ListStats:
             - str
         """
 
-        if not self._soups:
+        if not self._lists:
             raise exceptions.UnpopulatedError
 
         data = {'series_id': self.id}
-        for key in self._soups.keys():
-            data[key] = []
-            for l in self.general_list(key):
-                data[key].append({'user_id': l.user_id,
-                                  'username': l.username})
+        for key, entries in self._lists.items():
+            data[key] = [{'user_id': user_id, 'username': username}
+                         for user_id, username in zip(entries.user_ids, entries.usernames)]
+        import json
         return json.dumps(data)
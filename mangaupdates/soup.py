@@ -0,0 +1,396 @@
+"""BeautifulSoup backend for parsing series pages (`Series(parser='bs4')`).
+
+Every field function takes the `sContent` tag of its section (see `entries`)
+and returns or yields the same values as the corresponding `Series` property.
+"""
+
+from bs4 import BeautifulSoup, Comment
+import re
+
+from functools import partial
+
+from mangaupdates import exceptions
+from .authors import Author
+from .groups import Group
+from .publishers import Publisher, Magazine
+from .tags import Category
+from .users import UserReview, UserRating
+from .series import RelatedSeries, RecommendedSeries, Release, ForumStats, Rank, ActivityStats
+from .utils import remove_outer_parens, params_from_url, id_from_url, parse_timestamp
+
+
+def parse_page(text):
+    """Parses a decoded series page.
+
+    Returns:
+        - bs4.element.Tag: The `#main_content` element
+    Raises:
+        - exceptions.InvalidSeriesIDError
+        - exceptions.SeriesIDNotFoundError
+        - exceptions.ParseError: If there is no `#main_content`
+    """
+
+    soup = BeautifulSoup(text, 'lxml')
+    if soup.title.get_text(strip=True) == 'Baka-Updates :: Manga :: Info':
+        raise exceptions.InvalidSeriesIDError
+
+    # check if given series ID exists or redirected to list
+    # happens when id = 0 (it raises an exception from __init__), but idk
+    # if it happens with id > 0, so I'll keep it in
+    if soup.title.get_text(strip=True) == 'Baka-Updates Manga - Series':
+        # make sure (in case series name is "Series")
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            if 'Start:Series Rows' == comment.strip():
+                raise exceptions.SeriesIDNotFoundError
+
+    main_content = soup.find(id='main_content')
+    if main_content is None:
+        raise exceptions.ParseError('Main Content')
+    return main_content
+
+def parse_fragment(html):
+    """Parses a slice of a series page (see `mangaupdates.sections`)"""
+
+    return BeautifulSoup(html, 'lxml')
+
+def entries(main_content):
+    entries = {}
+    for sCat in main_content.find_all('div', class_='sCat'):
+        if sCat.b:
+            key = next(sCat.b.children).strip() # to avoid <b>Name <div>something else</div></b>
+                                                # see Status/Status in Country of Origin
+            entries[key] = sCat.find_next_sibling('div', class_='sContent')
+    return entries
+
+def title(main_content):
+    span = main_content.find('span', class_='releasestitle tabletitle')
+    if span is None:
+        raise exceptions.ParseError('Title')
+    return span.get_text(strip=True)
+
+def description(entry):
+    string = (entry.find(id='div_desc_link') or entry).get_text(strip=True)
+    if string == 'N/A':
+        return None
+    else:
+        return string
+
+def _text(entry):
+    return entry.get_text(strip=True)
+
+series_type = status = _text
+
+def year(entry):
+    yr = entry.get_text(strip=True)
+    if yr == 'N/A':
+        return None
+    else:
+        return yr   # not int because of id=118731 (yr='2019-2020')
+
+def _yes_no(entry):
+    val = entry.get_text(strip=True)
+    if val == 'Yes':
+        return True
+    elif val == 'No':
+        return False
+    else:
+        return None
+
+completely_scanlated = licensed_in_english = _yes_no
+
+def related_series(entry, make_series):
+    for a in entry.find_all('a', href=True):
+        title = a.get_text(strip=True)
+        series_id = id_from_url(a['href'])
+        relation = remove_outer_parens(a.next_sibling)
+        yield RelatedSeries(series=make_series(series_id, title=title),
+                            relation=relation)
+
+def associated_names(entry):
+    return (name for name in entry.stripped_strings)
+
+def groups_scanlating(entry):
+    for a in entry.find_all('a', href=True):
+        if a['href'].startswith('javascript'):  # skip 'More...' and 'Less...'
+            continue
+        group = Group(name=a.get_text(strip=True))
+        if a.has_attr('title') and (a['title'] == 'Group Info'):
+            group.id = id_from_url(a['href'])
+        yield group
+
+def latest_releases(entry, series_id):
+    elements = list(entry.children)
+    release = Release(series_id)
+    for element_index in range(len(elements)):
+        element = elements[element_index]
+        if element == 'v.':
+            release.volume = elements[element_index + 1].get_text(strip=True)
+        elif element == 'c.':
+            release.chapter = elements[element_index + 1].get_text(strip=True)
+        elif element.name == 'a' and element.has_attr('title') and element['title'] == 'Group Info':
+            release.groups.append(Group(name=element.get_text(strip=True),
+                                        id=id_from_url(element['href'])))
+        elif element.previous_element.name is None and element.previous_element.strip() == 'by':
+            release.groups.append(Group(name=element.get_text(strip=True)))
+        elif element.name == 'span':
+            release.elapsed = element.get_text(strip=True)
+        elif element.name == 'br':
+            yield release
+            release = Release(series_id)    # at last iteration release is not used
+
+def anime_chapters(entry):
+    strings = list(entry.stripped_strings)
+    if len(strings) == 1 and strings[0] == 'N/A':
+        return None
+    else:
+        return strings
+
+def user_reviews(entry):
+    for a in entry.find_all('a', href=True):
+        review_id = id_from_url(a['href'])
+        review_name = a.get_text(strip=True)
+        reviewer = a.next_sibling.strip()[3:]   # remove 'by ' from 'by User'
+        yield UserReview(review_id, review_name, reviewer)
+
+def forum(entry):
+    string = next(entry.stripped_strings)
+
+    pattern = r'(\d+) topics, (\d+) posts'
+    matches = re.search(pattern, string, re.IGNORECASE)
+    if not matches:
+        raise exceptions.RegexParseError(pattern=pattern, string=string)
+    topics = int(matches.group(1))
+    posts = int(matches.group(2))
+
+    # extract forum id
+    params = params_from_url(entry.a['href'])
+    if 'fid' not in params:
+        raise exceptions.ParseError("Forum ('fid')")
+    fid = int(params['fid'][0])
+
+    return ForumStats(fid, topics, posts)
+
+def user_rating(div):
+    if div.get_text(strip=True) == 'N/A':
+        return None
+
+    string = div.next_element.strip()
+    pattern = r'Average: (\d+\.?\d*)'
+    matches = re.search(pattern, string, re.IGNORECASE)
+    if not matches:
+        raise exceptions.RegexParseError(pattern, string)
+    average = float(matches.group(1))
+
+    span = div.find('span')
+    if span and span.next_sibling and span.next_sibling.name is None:
+        string = span.next_sibling.strip()
+        pattern = r'(\d+) votes'
+        matches = re.search(pattern, string, re.IGNORECASE)
+        if not matches:
+            raise exceptions.RegexParseError(pattern=pattern, string=string)
+        votes = int(matches.group(1))
+    else:
+        raise exceptions.ParseError('User Rating (Votes)')
+
+    b = div.find('b')
+    if b:
+        string = b.get_text(strip=True)
+        pattern = r'\d+\.?\d*'
+        matches = re.search(pattern, string, re.IGNORECASE)
+        if not matches:
+            raise exceptions.RegexParseError(pattern=pattern, string=string)
+        bayesian_average = float(matches.group(0))
+    else:
+        raise exceptions.ParseError('User Rating (Bayesian Average)')
+
+    histogram = div.find_all('div', class_='row no-gutters')
+    distribution = {}
+    for bin in histogram:
+        if bin.div:
+            key = bin.div.get_text(strip=True)
+            val = next(bin.find('div', class_='text-right').stripped_strings)
+            distribution[key] = val
+
+    return UserRating(average, bayesian_average, votes, distribution)
+
+def last_updated(entry):
+    updated = entry.get_text(strip=True)
+    if updated == 'N/A':
+        return None
+    else:
+        return parse_timestamp(updated)
+
+def image(entry):
+    img = entry.img
+    if img and img.has_attr('src'):
+        return img['src']
+    else:
+        return None
+
+def genres(entry):
+    for u in entry.select('a > u'):
+        yield u.get_text(strip=True)
+
+def categories(entry):
+    score_pattern = re.compile(r'Score: (-?\d+) \((\d+),(\d+)\)', re.IGNORECASE)
+    for a in entry.select('li > a[title]'):
+        string = a['title']
+        matches = re.search(score_pattern, string)
+        if not matches:
+            raise exceptions.RegexParseError(pattern=score_pattern.pattern, string=string)
+
+        score = int(matches.group(1))   # agree - disagree
+        agree = int(matches.group(2))
+        disagree = int(matches.group(3))
+        name = a.get_text(strip=True)
+
+        yield Category(name, score, agree, disagree)
+
+def category_recommendations(entry, make_series):
+    for a in entry.find_all('a', href=True):
+        series_id = id_from_url(a['href'])
+        series_name = a.get_text(strip=True)
+        yield make_series(series_id, title=series_name)
+
+def recommendations(entry, make_series):
+    divs = entry.select('#div_recom_more > div')
+    if not divs:
+        return
+
+    # get measure of intensity of the last recommendation
+    try:
+        base_color = divs[-1]['style'].split(':')[1][1:]
+        rgb = base_color[:2], base_color[2:4], base_color[4:]
+        base_intensity = sum(map(partial(int, base=16), rgb))
+    except (KeyError, IndexError):
+        base_intensity = None
+
+    for div in divs:
+        level = None
+        if base_intensity:
+            try:
+                # get color of entry, remove leading '#'
+                color = div['style'].split(':')[1][1:]  # hex string
+
+                # lower intensity = darker shade <-> better recommendation
+                intensity = sum(map(partial(int, base=16), (color[:2], color[2:4], color[4:])))
+
+                # base color = lightest shade <-> minimum bar for recommendation
+                # set base color as 0
+                level = base_intensity - intensity
+            except (KeyError, IndexError):
+                pass
+
+        a = div.a
+        series_id = id_from_url(a['href'])
+        if series_id is None:
+            raise exceptions.ParseError('Recommendations (Series ID)')
+        series_name = a.get_text(strip=True)
+        series = make_series(series_id, title=series_name)
+
+        yield RecommendedSeries(series=series, level=level)
+
+def authors(entry):
+    for a in entry.find_all('a', href=True):
+        yield Author(id=id_from_url(a['href']),
+                     name=a.get_text(strip=True))
+
+artists = authors
+
+def original_publisher(entry):
+    a = entry.a
+    if a:
+        publisher_id = id_from_url(a.get('href'))
+        if a.has_attr('title') and a['title'] == 'Publisher Info':
+            publisher_name = a.get_text(strip=True)
+        elif a.get_text(strip=True) == 'Add':
+            publisher_name = a.parent.get_text(strip=True)[:-len('\xa0[Add]')]
+        else:
+            raise exceptions.ParseError('Original Publisher (Name)')
+        return Publisher(publisher_name, publisher_id)
+    else:
+        return None
+
+def serialized_in(entry, domain):
+    for a in entry.find_all('a', href=True):
+        magazine = Magazine(url=f"{domain}/{a['href']}",
+                            name=a.get_text(strip=True))
+        if a.next_sibling and a.next_sibling.name is None:
+            magazine.parent = remove_outer_parens(a.next_sibling)
+        yield magazine
+
+def english_publisher(entry):
+    for a in entry.find_all('a', href=True):
+        publisher = Publisher(id=id_from_url(a['href']),
+                              name=a.get_text(strip=True))
+        if a.next_sibling and a.next_sibling.name is None:
+            publisher.note = remove_outer_parens(a.next_sibling)
+        yield publisher
+
+def activity_stats(entry):
+    stats = ActivityStats()
+    for a in entry.find_all('a', href=True):
+        interval = a.get_text(strip=True)
+        b = a.find_next_sibling('b')
+        if not b:
+            raise exceptions.ParseError('Activity Stats (Position)')
+        position = int(b.get_text(strip=True))
+        rank = Rank(position)
+
+        img = a.find_next_sibling('img')
+        if img and img.next_sibling and img.next_sibling.name is None:
+            rank.change = int(remove_outer_parens(img.next_sibling))
+
+        if interval == 'Weekly':
+            stats.weekly = rank
+        elif interval == 'Monthly':
+            stats.monthly = rank
+        elif interval == '3 Month':
+            stats.quarterly = rank
+        elif interval == '6 Month':
+            stats.semiannual = rank
+        elif interval == 'Year':
+            stats.yearly = rank
+    return stats
+
+def list_stats(entry, make_list_stats):
+    stats = {}
+    for b in entry.find_all('b'):
+        num_users = int(b.get_text(strip=True))
+        if b.next_sibling and b.next_sibling.name is None:
+            list_name = b.next_sibling.strip()
+        else:
+            raise exceptions.ParseError('List Stats (List Name)')
+        key = ''.join((list_name[:-len(' lists')], '_total'))
+        stats[key] = num_users
+    return make_list_stats(**stats)
+
+def parse_list_page(text, list_name):
+    """Parses a decoded list page (`ListStats`)
+
+    Raises:
+        - exceptions.InvalidListNameError
+    """
+
+    soup = BeautifulSoup(text, 'lxml')
+    if soup.head.title.get_text(strip=True) == 'Baka-Updates :: Manga :: Info':
+        raise exceptions.InvalidListNameError(repr(list_name), 'is an invalid list name.')
+    return soup
+
+def list_entries(soup, list_name):
+    """Yields the (user id, username, rating) of each entry of a list page"""
+
+    rows = soup.p.find_next_sibling('p')
+    if not rows:
+        return
+
+    prefix = 'javascript:loadUser(' # for extracting the user id
+    suffix = f',"{list_name}")'
+    for a in rows.find_all('a', recursive=False, href=True):
+        username = a.get_text(strip=True)
+        user_id = int(a['href'][len(prefix):-len(suffix)])
+        rating = None
+        if a.next_sibling == ' - Rating: ':
+            rating = float(a.find_next_sibling('b').get_text(strip=True))
+
+        yield user_id, username, rating
@@ -0,0 +1,360 @@
+"""HTTP transport: the `requests.Session` that every class sending requests
+uses by default.
+
+`make_session()` sizes the connection pool for the number of requests sent at
+once (blocking instead of opening throwaway connections past it), keeps the
+connections alive, accepts compressed responses (brotli too, if `brotli` or
+`brotlicffi` is installed) and sets a default timeout, so that a stalled
+connection can't hang a worker forever. A request waits at most `POOL_TIMEOUT`
+for a connection of a full pool, so that connections that are never released
+(a streamed response left open) raise an error instead of a deadlock.
+
+Any object with the `get(url, params=None, headers=None, stream=False,
+timeout=None)` of a `requests.Session`, returning a `requests.Response`, can
+send the requests instead (it's what the `session` arguments accept), so the
+HTTP client can be swapped without touching the parsing code:
+`make_session(backend='urllib3')` sends them straight through urllib3's
+connection pools (skipping the overhead of `requests`), and
+`make_session(backend='httpx')` through httpx (`pip install httpx`, and `h2`
+for HTTP/2). `FakeSession` answers them in-process, without any network.
+Their connection errors and timeouts are raised as those of `requests`, so
+`RetrySession` and `AdaptiveSession` work the same on top of them.
+`scripts/benchmark_transports.py` compares them against a local server.
+"""
+
+import io
+from urllib.parse import urljoin
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+
+TIMEOUT = (10, 60)  # seconds: (connect, read)
+POOL_TIMEOUT = 300  # seconds waiting for a free connection of a full pool
+CONCURRENCY = 10
+BACKENDS = ('requests', 'urllib3', 'httpx')
+
+
+def importable(module):
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+def accept_encoding():
+    """Value of the `Accept-Encoding` header: the encodings urllib3 can decode"""
+
+    if importable('brotli') or importable('brotlicffi'):
+        return 'gzip, deflate, br'
+    return 'gzip, deflate'
+
+def split_timeout(timeout):
+    """`(connect, read)` seconds of a `requests` timeout (a float, a tuple or None)"""
+
+    if isinstance(timeout, tuple):
+        return timeout
+    return timeout, timeout
+
+
+class TimeoutSession(requests.Session):
+    """`requests.Session` whose requests time out after `timeout` by default"""
+
+    __attrs__ = requests.Session.__attrs__ + ['timeout']
+
+    def __init__(self, timeout=TIMEOUT):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+class PoolTimeoutMixin:
+    """Connection pool (`urllib3.HTTPConnectionPool`) whose requests wait at
+    most `pool_timeout` seconds for a free connection"""
+
+    pool_timeout = None
+
+    def urlopen(self, method, url, **kwargs):
+        kwargs.setdefault('pool_timeout', self.pool_timeout)
+        return super().urlopen(method, url, **kwargs)
+
+class PoolTimeoutAdapter(HTTPAdapter):
+    """`HTTPAdapter` whose requests wait at most `pool_timeout` seconds for a
+    connection of a full pool (`pool_block=True`), then raise
+    `requests.exceptions.ConnectionError`"""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ['pool_timeout']
+
+    def __init__(self, pool_timeout=POOL_TIMEOUT, **kwargs):
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(cls.__name__, (PoolTimeoutMixin, cls), {'pool_timeout': self.pool_timeout})
+            for scheme, cls in self.poolmanager.pool_classes_by_scheme.items()}
+
+    def send(self, request, *args, **kwargs):
+        from urllib3.exceptions import EmptyPoolError
+
+        try:
+            return super().send(request, *args, **kwargs)
+        except EmptyPoolError as e:  # re-raised as is by `HTTPAdapter`
+            raise requests.exceptions.ConnectionError(e, request=request) from e
+
+
+def make_session(concurrency=CONCURRENCY, timeout=TIMEOUT, backend='requests',
+                 pool_timeout=POOL_TIMEOUT):
+    """A session for sending up to `concurrency` requests at once.
+
+    Arguments:
+        - concurrency (int):
+            Optional. Connections kept alive per host; more requests at once
+            wait for one of them. Defaults to `CONCURRENCY`.
+        - timeout (float or tuple(float, float)):
+            Optional. Default timeout of the requests, in seconds (see
+            `requests.request`). Defaults to `TIMEOUT`.
+        - pool_timeout (float):
+            Optional. Seconds a request waits for a connection when all
+            `concurrency` are in use, before raising
+            `requests.exceptions.ConnectionError`. None waits as long as it
+            takes. Defaults to `POOL_TIMEOUT`.
+        - backend (str):
+            Optional. HTTP client that sends the requests: one of `BACKENDS`.
+            Defaults to 'requests'.
+    Returns:
+        TimeoutSession, Urllib3Session or HttpxSession
+    Raises:
+        - ValueError: If `backend` is unknown
+        - ImportError: If the client of `backend` isn't installed
+    """
+
+    if backend == 'urllib3':
+        return Urllib3Session(concurrency, timeout, pool_timeout)
+    if backend == 'httpx':
+        return HttpxSession(concurrency, timeout, pool_timeout=pool_timeout)
+    if backend != 'requests':
+        raise ValueError(f'{backend!r} is not one of {BACKENDS}')
+
+    session = TimeoutSession(timeout)
+    adapter = PoolTimeoutAdapter(pool_timeout, pool_maxsize=concurrency, pool_block=True)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = accept_encoding()
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def build_response(url, status_code, headers, raw=None, content=None, reason=None):
+    """`requests.Response` of a request sent by another client, whose body
+    is either `content` or read from `raw` (a file-like object, or an object
+    with the `stream()` of a `urllib3.HTTPResponse`)"""
+
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    if raw is None:
+        response._content = content
+        response._content_consumed = True
+    else:
+        response.raw = raw
+    return response
+
+
+class BaseSession:
+    """Default headers, default timeout and context manager of the sessions
+    of the other backends"""
+
+    def __init__(self, timeout=TIMEOUT):
+        self.timeout = timeout
+        self.headers = CaseInsensitiveDict({'Accept-Encoding': accept_encoding()})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        pass
+
+    def prepare(self, url, params=None, headers=None, timeout=None):
+        """URL (with `params`), headers and `(connect, read)` timeout of a request"""
+
+        request = requests.models.PreparedRequest()
+        request.prepare_url(url, params)
+        merged = CaseInsensitiveDict(self.headers)
+        merged.update(headers or {})
+        return request.url, merged, split_timeout(self.timeout if timeout is None else timeout)
+
+
+class Urllib3Session(BaseSession):
+    """Session that sends the requests through a `urllib3.PoolManager` (see
+    `make_session()`)"""
+
+    def __init__(self, concurrency=CONCURRENCY, timeout=TIMEOUT, pool_timeout=POOL_TIMEOUT):
+        import urllib3
+
+        super().__init__(timeout)
+        self.pool_timeout = pool_timeout
+        # no retries (that's `RetrySession`'s job), but follow redirects
+        retries = urllib3.Retry(total=None, connect=0, read=0, status=0, other=0,
+                                redirect=10, raise_on_redirect=False)
+        self.pool = urllib3.PoolManager(maxsize=concurrency, block=True, retries=retries)
+
+    def __repr__(self):
+        return f'Urllib3Session(timeout={self.timeout!r})'
+
+    def close(self):
+        self.pool.clear()
+
+    def get(self, url, params=None, headers=None, stream=False, timeout=None):
+        import urllib3
+
+        url, headers, (connect, read) = self.prepare(url, params, headers, timeout)
+        try:
+            raw = self.pool.request('GET', url, headers=headers, preload_content=False,
+                                    timeout=urllib3.Timeout(connect=connect, read=read),
+                                    pool_timeout=self.pool_timeout)
+        except urllib3.exceptions.HTTPError as e:
+            raise urllib3_error(e, url) from e
+
+        # `raw.geturl()` is only the path: follow the redirects from `url`
+        for redirect in raw.retries.history if raw.retries else ():
+            if redirect.redirect_location:
+                url = urljoin(url, redirect.redirect_location)
+        response = build_response(url, raw.status, raw.headers, raw=raw, reason=raw.reason)
+        if not stream:
+            response.content    # reads the body
+            raw.release_conn()
+        return response
+
+def urllib3_error(error, url):
+    """The `requests` exception matching a urllib3 one (as in `requests.adapters`)"""
+
+    import urllib3
+
+    reason = error.reason if isinstance(error, urllib3.exceptions.MaxRetryError) else error
+    if isinstance(reason, urllib3.exceptions.NewConnectionError):    # a `ConnectTimeoutError`
+        return requests.exceptions.ConnectionError(error, request=None)
+    if isinstance(reason, urllib3.exceptions.ConnectTimeoutError):
+        return requests.exceptions.ConnectTimeout(error, request=None)
+    if isinstance(reason, urllib3.exceptions.TimeoutError):
+        return requests.exceptions.ReadTimeout(error, request=None)
+    return requests.exceptions.ConnectionError(error, request=None)
+
+
+class HttpxSession(BaseSession):
+    """Session that sends the requests through an `httpx.Client`, over
+    HTTP/2 if `h2` is installed (see `make_session()`)"""
+
+    def __init__(self, concurrency=CONCURRENCY, timeout=TIMEOUT, http2=None,
+                 pool_timeout=POOL_TIMEOUT):
+        import httpx
+
+        super().__init__(timeout)
+        self.pool_timeout = pool_timeout
+        self.http2 = importable('h2') if http2 is None else http2
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        self.client = httpx.Client(http2=self.http2, limits=limits, follow_redirects=True)
+
+    def __repr__(self):
+        return f'HttpxSession(timeout={self.timeout!r}, http2={self.http2})'
+
+    def close(self):
+        self.client.close()
+
+    def get(self, url, params=None, headers=None, stream=False, timeout=None):
+        import httpx
+
+        url, headers, (connect, read) = self.prepare(url, params, headers, timeout)
+        timeout = httpx.Timeout(read, connect=connect, pool=self.pool_timeout)
+        try:
+            request = self.client.build_request('GET', url, headers=dict(headers), timeout=timeout)
+            raw = self.client.send(request, stream=True)
+            if not stream:
+                raw.read()
+                raw.close()
+        except httpx.TransportError as e:
+            raise httpx_error(e) from e
+
+        if stream:
+            return build_response(str(raw.url), raw.status_code, raw.headers.multi_items(),
+                                  raw=HttpxBody(raw), reason=raw.reason_phrase)
+        return build_response(str(raw.url), raw.status_code, raw.headers.multi_items(),
+                              content=raw.content, reason=raw.reason_phrase)
+
+def httpx_error(error):
+    import httpx
+
+    if isinstance(error, httpx.PoolTimeout):    # as the other backends
+        return requests.exceptions.ConnectionError(error, request=None)
+    if isinstance(error, httpx.ConnectTimeout):
+        return requests.exceptions.ConnectTimeout(error, request=None)
+    if isinstance(error, httpx.TimeoutException):
+        return requests.exceptions.ReadTimeout(error, request=None)
+    return requests.exceptions.ConnectionError(error, request=None)
+
+class HttpxBody:
+    """Body of a streamed `httpx.Response`, read by `requests.Response.iter_content()`"""
+
+    def __init__(self, response):
+        self.response = response
+
+    def stream(self, chunk_size, decode_content=True):
+        import httpx
+
+        try:
+            yield from self.response.iter_bytes(chunk_size)
+        except httpx.TransportError as e:
+            raise httpx_error(e) from e
+
+    def close(self):
+        self.response.close()
+
+    def release_conn(self):
+        self.response.close()
+
+
+class FakeSession(BaseSession):
+    """Session that answers the requests in-process, with the pages returned
+    by `handler` (e.g. to measure the parsing without the network)
+
+    Arguments:
+        - handler (callable):
+            Called with the URL and the params of each request; returns the
+            page (bytes), or None for a 404.
+        - encoding (str): Optional. Encoding of the pages. Defaults to 'utf-8'.
+
+    Attributes:
+        - requests (int): Number of requests answered
+    """
+
+    def __init__(self, handler, encoding='utf-8'):
+        super().__init__()
+        self.handler = handler
+        self.encoding = encoding
+        self.requests = 0
+
+    def __repr__(self):
+        return f'FakeSession({self.handler!r})'
+
+    def get(self, url, params=None, headers=None, stream=False, timeout=None):
+        self.requests += 1
+        page = self.handler(url, params)
+        headers = {'Content-Type': f'text/html; charset={self.encoding}'}
+        url, _, _ = self.prepare(url, params)
+        if page is None:
+            return build_response(url, 404, headers, content=b'', reason='Not Found')
+        if stream:
+            return build_response(url, 200, headers, raw=io.BytesIO(page), reason='OK')
+        return build_response(url, 200, headers, content=page, reason='OK')
@@ -1,3 +1,7 @@
+import codecs
+import re
+from datetime import datetime
+from functools import lru_cache
 import urllib.parse as urlparse
 from urllib.parse import parse_qs
 
@@ -21,3 +25,88 @@ def id_from_url(url):
         return int(params['id'][0])
     else:
         return None
+
+_meta_charset = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w-]+)', re.IGNORECASE)
+
+SNIFF_SIZE = 4096
+
+def sniff_encoding(content, encoding=None):
+    """Encoding of an HTML page.
+
+    The charset declared in the page's `<meta>` tag (searched for only in the
+    first `SNIFF_SIZE` bytes) takes precedence, then `encoding` (e.g. from the
+    HTTP headers), then UTF-8.
+    """
+
+    match = _meta_charset.search(content, 0, SNIFF_SIZE)
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode('ascii')).name
+        except LookupError:     # unknown charset name
+            pass
+    return encoding or 'utf-8'
+
+def decode_html(content, encoding=None):
+    """Decodes an HTML page exactly once (see `sniff_encoding`). Undecodable
+    bytes are replaced instead of raising.
+    """
+
+    return content.decode(sniff_encoding(content, encoding), errors='replace')
+
+def decode_chunks(chunks, encoding=None):
+    """Decodes the chunks (bytes) of an HTML page as they come, like
+    `decode_html` (the encoding is sniffed from the first `SNIFF_SIZE` bytes).
+
+    Yields:
+        - str
+    """
+
+    chunks = iter(chunks)
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= SNIFF_SIZE:
+            break
+    decoder = codecs.getincrementaldecoder(sniff_encoding(head, encoding))(errors='replace')
+    yield decoder.decode(head)
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+_months = {month: number for number, month in enumerate(
+    ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+     'August', 'September', 'October', 'November', 'December'), start=1)}
+
+# e.g. 'January 18th 2021, 1:48pm UTC'
+_timestamp = re.compile(r'([A-Z][a-z]+) (\d{1,2})(?:st|nd|rd|th) (\d{4}), '
+                        r'(\d{1,2}):(\d{2})([ap]m)(?: ([A-Za-z]+))?')
+
+# time zone name -> tzinfo that `dateutil.parser.parse` gives it
+_tzinfos = {}
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(string):
+    """Parses a timestamp in the site's format (e.g. 'January 18th 2021,
+    1:48pm UTC') into the same `datetime` as `dateutil.parser.parse`.
+
+    Falls back to `dateutil.parser.parse` for anything else, and for the first
+    timestamp of every time zone name (to learn its `tzinfo`). Results are
+    memoized, since many series share the same timestamp.
+    """
+
+    match = _timestamp.fullmatch(string)
+    if match:
+        month, day, year, hour, minute, am_pm, tzname = match.groups()
+        hour = int(hour) % 12 + (12 if am_pm == 'pm' else 0)
+        try:
+            timestamp = datetime(int(year), _months[month], int(day), hour, int(minute))
+        except (KeyError, ValueError):  # unknown month, out of range
+            timestamp = None
+        if timestamp is not None and tzname in _tzinfos:
+            return timestamp.replace(tzinfo=_tzinfos[tzname])
+
+    import dateutil.parser
+    parsed = dateutil.parser.parse(string)
+    if match and timestamp == parsed.replace(tzinfo=None):
+        _tzinfos[match.group(7)] = parsed.tzinfo
+    return parsed
@@ -0,0 +1,526 @@
+"""lxml backend for parsing series pages (`Series(parser='lxml')`).
+
+Mirrors `mangaupdates.soup` function for function, but runs precompiled
+XPath expressions and regular expressions over an `lxml.html` tree instead of
+walking a BeautifulSoup tree. Text nodes are `str`s here, so the helpers below
+reproduce BeautifulSoup's `get_text(strip=True)`, `stripped_strings`,
+`next_sibling` and `previous_element` semantics where the parsing relies on
+them.
+"""
+
+import lxml.html
+from lxml import etree
+import re
+
+from mangaupdates import exceptions
+from .authors import Author
+from .groups import Group
+from .publishers import Publisher, Magazine
+from .tags import Category
+from .users import UserReview, UserRating
+from .series import RelatedSeries, RecommendedSeries, Release, ForumStats, Rank, ActivityStats
+from .utils import remove_outer_parens, params_from_url, id_from_url, parse_timestamp
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_page_title = etree.XPath('string(/html/head/title)', smart_strings=False)
+_comments = etree.XPath('//comment()')
+_main_content = etree.XPath("//*[@id='main_content']")
+_sCats = etree.XPath(f"descendant::div[{_has_class('sCat')}]")
+_first_b = etree.XPath('descendant::b[1]')
+_sContent = etree.XPath(f"following-sibling::div[{_has_class('sContent')}][1]")
+_title_span = etree.XPath("descendant::span[normalize-space(@class)='releasestitle tabletitle'][1]")
+_desc_link = etree.XPath("descendant::*[@id='div_desc_link'][1]")
+_strings = etree.XPath('descendant::text()', smart_strings=False)
+_links = etree.XPath('descendant::a[@href]')
+_first_a = etree.XPath('descendant::a[1]')
+_first_span = etree.XPath('descendant::span[1]')
+_first_div = etree.XPath('descendant::div[1]')
+_first_img = etree.XPath('descendant::img[1]')
+_histogram = etree.XPath("descendant::div[normalize-space(@class)='row no-gutters']")
+_histogram_value = etree.XPath(f"descendant::div[{_has_class('text-right')}][1]")
+_genres = etree.XPath('descendant::u[parent::a]')
+_categories = etree.XPath('descendant::a[@title][parent::li]')
+_recommendations = etree.XPath("descendant::*[@id='div_recom_more']/div")
+_next_b = etree.XPath('following-sibling::b[1]')
+_next_img = etree.XPath('following-sibling::img[1]')
+_bold = etree.XPath('descendant::b')
+
+_forum_pattern = re.compile(r'(\d+) topics, (\d+) posts', re.IGNORECASE)
+_average_pattern = re.compile(r'Average: (\d+\.?\d*)', re.IGNORECASE)
+_votes_pattern = re.compile(r'(\d+) votes', re.IGNORECASE)
+_number_pattern = re.compile(r'\d+\.?\d*', re.IGNORECASE)
+_score_pattern = re.compile(r'Score: (-?\d+) \((\d+),(\d+)\)', re.IGNORECASE)
+
+
+def _first(xpath, element):
+    results = xpath(element)
+    return results[0] if results else None
+
+def _stripped_strings(node):
+    if isinstance(node, str):
+        strings = (node,)
+    else:
+        strings = _strings(node)
+    return [string for string in (s.strip() for s in strings) if string]
+
+def _get_text(node):
+    return ''.join(_stripped_strings(node))
+
+def _children(element):
+    """Child nodes of `element`, text included (like bs4's `.children`)"""
+
+    nodes = [element.text] if element.text else []
+    for child in element:
+        nodes.append(child)
+        if child.tail:
+            nodes.append(child.tail)
+    return nodes
+
+def _previous_element(nodes, index):
+    """bs4's `nodes[index].previous_element`: the node right before it in
+    document order, i.e. the last node inside its previous sibling"""
+
+    if index == 0:
+        return None     # the parent
+    element = nodes[index - 1]
+    if isinstance(element, str):
+        return element
+    while len(element):
+        child = element[-1]
+        if child.tail:
+            return child.tail
+        element = child
+    return element.text or element
+
+def _is_by(node):
+    return isinstance(node, str) and node.strip() == 'by'
+
+def _name(node):
+    return None if isinstance(node, str) else node.tag
+
+
+def parse_page(text):
+    """Parses a decoded series page.
+
+    Returns:
+        - lxml.html.HtmlElement: The `#main_content` element
+    Raises:
+        - exceptions.InvalidSeriesIDError
+        - exceptions.SeriesIDNotFoundError
+        - exceptions.ParseError: If there is no `#main_content`
+    """
+
+    document = lxml.html.document_fromstring(text)
+    page_title = _page_title(document).strip()
+    if page_title == 'Baka-Updates :: Manga :: Info':
+        raise exceptions.InvalidSeriesIDError
+
+    # see `soup.parse_page`
+    if page_title == 'Baka-Updates Manga - Series':
+        for comment in _comments(document):
+            if 'Start:Series Rows' == (comment.text or '').strip():
+                raise exceptions.SeriesIDNotFoundError
+
+    main_content = _first(_main_content, document)
+    if main_content is None:
+        raise exceptions.ParseError('Main Content')
+    return main_content
+
+def parse_fragment(html):
+    """Parses a slice of a series page (see `mangaupdates.sections`)"""
+
+    return lxml.html.document_fromstring(html)
+
+def entries(main_content):
+    entries = {}
+    for sCat in _sCats(main_content):
+        b = _first(_first_b, sCat)
+        if b is not None:
+            key = (b.text or '').strip()    # see Status/Status in Country of Origin
+            entries[key] = _first(_sContent, sCat)
+    return entries
+
+def title(main_content):
+    span = _first(_title_span, main_content)
+    if span is None:
+        raise exceptions.ParseError('Title')
+    return _get_text(span)
+
+def description(entry):
+    desc_link = _first(_desc_link, entry)
+    string = _get_text(entry if desc_link is None else desc_link)
+    if string == 'N/A':
+        return None
+    else:
+        return string
+
+series_type = status = _get_text
+
+def year(entry):
+    yr = _get_text(entry)
+    if yr == 'N/A':
+        return None
+    else:
+        return yr
+
+def _yes_no(entry):
+    val = _get_text(entry)
+    if val == 'Yes':
+        return True
+    elif val == 'No':
+        return False
+    else:
+        return None
+
+completely_scanlated = licensed_in_english = _yes_no
+
+def related_series(entry, make_series):
+    for a in _links(entry):
+        yield RelatedSeries(series=make_series(id_from_url(a.get('href')),
+                                               title=_get_text(a)),
+                            relation=remove_outer_parens(a.tail or ''))
+
+def associated_names(entry):
+    return iter(_stripped_strings(entry))
+
+def groups_scanlating(entry):
+    for a in _links(entry):
+        href = a.get('href')
+        if href.startswith('javascript'):   # skip 'More...' and 'Less...'
+            continue
+        group = Group(name=_get_text(a))
+        if a.get('title') == 'Group Info':
+            group.id = id_from_url(href)
+        yield group
+
+def latest_releases(entry, series_id):
+    nodes = _children(entry)
+    release = Release(series_id)
+    for index, node in enumerate(nodes):
+        name = _name(node)
+        if node == 'v.':
+            release.volume = _get_text(nodes[index + 1])
+        elif node == 'c.':
+            release.chapter = _get_text(nodes[index + 1])
+        elif name == 'a' and node.get('title') == 'Group Info':
+            release.groups.append(Group(name=_get_text(node),
+                                        id=id_from_url(node.get('href'))))
+        elif _is_by(_previous_element(nodes, index)):
+            release.groups.append(Group(name=_get_text(node)))
+        elif name == 'span':
+            release.elapsed = _get_text(node)
+        elif name == 'br':
+            yield release
+            release = Release(series_id)
+
+def anime_chapters(entry):
+    strings = _stripped_strings(entry)
+    if len(strings) == 1 and strings[0] == 'N/A':
+        return None
+    else:
+        return strings
+
+def user_reviews(entry):
+    for a in _links(entry):
+        reviewer = (a.tail or '').strip()[3:]  # remove 'by ' from 'by User'
+        yield UserReview(id_from_url(a.get('href')), _get_text(a), reviewer)
+
+def forum(entry):
+    string = _stripped_strings(entry)[0]
+    matches = _forum_pattern.search(string)
+    if not matches:
+        raise exceptions.RegexParseError(pattern=_forum_pattern.pattern, string=string)
+    topics = int(matches.group(1))
+    posts = int(matches.group(2))
+
+    params = params_from_url(_first(_first_a, entry).get('href'))
+    if 'fid' not in params:
+        raise exceptions.ParseError("Forum ('fid')")
+    fid = int(params['fid'][0])
+
+    return ForumStats(fid, topics, posts)
+
+def user_rating(div):
+    if _get_text(div) == 'N/A':
+        return None
+
+    string = (div.text or '').strip()
+    matches = _average_pattern.search(string)
+    if not matches:
+        raise exceptions.RegexParseError(_average_pattern.pattern, string)
+    average = float(matches.group(1))
+
+    span = _first(_first_span, div)
+    if span is not None and span.tail:
+        string = span.tail.strip()
+        matches = _votes_pattern.search(string)
+        if not matches:
+            raise exceptions.RegexParseError(pattern=_votes_pattern.pattern, string=string)
+        votes = int(matches.group(1))
+    else:
+        raise exceptions.ParseError('User Rating (Votes)')
+
+    b = _first(_first_b, div)
+    if b is not None:
+        string = _get_text(b)
+        matches = _number_pattern.search(string)
+        if not matches:
+            raise exceptions.RegexParseError(pattern=_number_pattern.pattern, string=string)
+        bayesian_average = float(matches.group(0))
+    else:
+        raise exceptions.ParseError('User Rating (Bayesian Average)')
+
+    distribution = {}
+    for bin in _histogram(div):
+        key = _first(_first_div, bin)
+        if key is not None:
+            distribution[_get_text(key)] = _stripped_strings(_first(_histogram_value, bin))[0]
+
+    return UserRating(average, bayesian_average, votes, distribution)
+
+def last_updated(entry):
+    updated = _get_text(entry)
+    if updated == 'N/A':
+        return None
+    else:
+        return parse_timestamp(updated)
+
+def image(entry):
+    img = _first(_first_img, entry)
+    if img is not None:
+        return img.get('src')
+    else:
+        return None
+
+def genres(entry):
+    for u in _genres(entry):
+        yield _get_text(u)
+
+def categories(entry):
+    for a in _categories(entry):
+        string = a.get('title')
+        matches = _score_pattern.search(string)
+        if not matches:
+            raise exceptions.RegexParseError(pattern=_score_pattern.pattern, string=string)
+
+        score = int(matches.group(1))   # agree - disagree
+        agree = int(matches.group(2))
+        disagree = int(matches.group(3))
+
+        yield Category(_get_text(a), score, agree, disagree)
+
+def category_recommendations(entry, make_series):
+    for a in _links(entry):
+        yield make_series(id_from_url(a.get('href')), title=_get_text(a))
+
+def _intensity(div):
+    """Sum of the RGB components of a `style="background-color:#rrggbb"`"""
+
+    style = div.get('style')
+    if style is None:
+        raise KeyError('style')
+    color = style.split(':')[1][1:]     # remove leading '#'
+    return int(color[:2], 16) + int(color[2:4], 16) + int(color[4:], 16)
+
+def recommendations(entry, make_series):
+    divs = _recommendations(entry)
+    if not divs:
+        return
+
+    # see `soup.recommendations`
+    try:
+        base_intensity = _intensity(divs[-1])
+    except (KeyError, IndexError):
+        base_intensity = None
+
+    for div in divs:
+        level = None
+        if base_intensity:
+            try:
+                level = base_intensity - _intensity(div)
+            except (KeyError, IndexError):
+                pass
+
+        a = _first(_first_a, div)
+        series_id = id_from_url(a.get('href', ''))
+        if series_id is None:
+            raise exceptions.ParseError('Recommendations (Series ID)')
+
+        yield RecommendedSeries(series=make_series(series_id, title=_get_text(a)),
+                                level=level)
+
+def authors(entry):
+    for a in _links(entry):
+        yield Author(id=id_from_url(a.get('href')), name=_get_text(a))
+
+artists = authors
+
+def original_publisher(entry):
+    a = _first(_first_a, entry)
+    if a is None:
+        return None
+
+    publisher_id = id_from_url(a.get('href', ''))
+    if a.get('title') == 'Publisher Info':
+        publisher_name = _get_text(a)
+    elif _get_text(a) == 'Add':
+        publisher_name = _get_text(a.getparent())[:-len('\xa0[Add]')]
+    else:
+        raise exceptions.ParseError('Original Publisher (Name)')
+    return Publisher(publisher_name, publisher_id)
+
+def serialized_in(entry, domain):
+    for a in _links(entry):
+        magazine = Magazine(url=f"{domain}/{a.get('href')}", name=_get_text(a))
+        if a.tail:
+            magazine.parent = remove_outer_parens(a.tail)
+        yield magazine
+
+def english_publisher(entry):
+    for a in _links(entry):
+        publisher = Publisher(id=id_from_url(a.get('href')), name=_get_text(a))
+        if a.tail:
+            publisher.note = remove_outer_parens(a.tail)
+        yield publisher
+
+_intervals = {'Weekly': 'weekly',
+              'Monthly': 'monthly',
+              '3 Month': 'quarterly',
+              '6 Month': 'semiannual',
+              'Year': 'yearly'}
+
+def activity_stats(entry):
+    stats = ActivityStats()
+    for a in _links(entry):
+        b = _first(_next_b, a)
+        if b is None:
+            raise exceptions.ParseError('Activity Stats (Position)')
+        rank = Rank(int(_get_text(b)))
+
+        img = _first(_next_img, a)
+        if img is not None and img.tail:
+            rank.change = int(remove_outer_parens(img.tail))
+
+        interval = _intervals.get(_get_text(a))
+        if interval:
+            setattr(stats, interval, rank)
+    return stats
+
+def list_stats(entry, make_list_stats):
+    stats = {}
+    for b in _bold(entry):
+        if not b.tail:
+            raise exceptions.ParseError('List Stats (List Name)')
+        list_name = b.tail.strip()
+        stats[f"{list_name[:-len(' lists')]}_total"] = int(_get_text(b))
+    return make_list_stats(**stats)
+
+_list_rows = etree.XPath('(//p)[1]/following-sibling::p[1]')
+_load_user = re.compile(r'javascript:loadUser\((\d+),')
+_list_parser = etree.HTMLParser()
+
+def parse_list_page(text, list_name):
+    """Parses a decoded list page (`ListStats`)
+
+    Raises:
+        - exceptions.InvalidListNameError
+    """
+
+    # plain elements (no `lxml.html` element classes) are cheaper to iterate
+    document = etree.fromstring(text, _list_parser)
+    if _page_title(document).strip() == 'Baka-Updates :: Manga :: Info':
+        raise exceptions.InvalidListNameError(repr(list_name), 'is an invalid list name.')
+    return document
+
+def list_entries(document, list_name):
+    """Yields the (user id, username, rating) of each entry of a list page
+    (see `soup.list_entries`)"""
+
+    rows = _first(_list_rows, document)
+    if rows is None:
+        return
+    yield from _row_entries(rows.iterchildren('a', 'b'))
+
+def _row_entries(elements):
+    """Entries of the <a> and <b> `elements` of the rows of a list page, whose
+    tails must be complete"""
+
+    # the rating of an entry is in the next <b> (if its tail is ' - Rating: '),
+    # so the entries from the first one with a rating wait for it here
+    waiting = []    # (user id, username, has a rating)
+    for element in elements:
+        if element.tag == 'a':
+            href = element.get('href')
+            if href is None:
+                continue
+            match = _load_user.match(href)
+            if not match:
+                raise exceptions.RegexParseError(pattern=_load_user.pattern, string=href)
+            # usually a username with no markup
+            username = (element.text or '').strip() if not len(element) else _get_text(element)
+            rated = element.tail == ' - Rating: '
+            if rated or waiting:
+                waiting.append((int(match.group(1)), username, rated))
+            else:
+                yield int(match.group(1)), username, None
+        elif waiting:
+            rating = float(element.text if not len(element) else _get_text(element))
+            for user_id, username, rated in waiting:
+                yield user_id, username, rating if rated else None
+            waiting = []
+    if waiting:
+        raise exceptions.ParseError('List (Rating)')
+
+def iter_list_entries(chunks, list_name):
+    """Yields the (user id, username, rating) of each entry of a list page, as
+    soon as the decoded `chunks` (str) of the page that hold it have been fed
+    to an incremental parser. The entries already yielded are removed from the
+    tree, so memory doesn't grow with the length of the list.
+
+    Raises:
+        - exceptions.InvalidListNameError
+    """
+
+    parser = etree.HTMLPullParser(events=('start', 'end'))
+
+    def elements():
+        first = rows = previous = None
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, element in parser.read_events():
+                if rows is None:
+                    if event == 'end' and element.tag == 'title':
+                        if (element.text or '').strip() == 'Baka-Updates :: Manga :: Info':
+                            raise exceptions.InvalidListNameError(repr(list_name),
+                                                                  'is an invalid list name.')
+                    elif event == 'start' and element.tag == 'p':
+                        # same as `_list_rows`
+                        if first is None:
+                            first = element
+                        elif element.getparent() is first.getparent():
+                            rows = element
+                    continue
+
+                # the tail of `previous` is complete once its next sibling
+                # starts, or its parent ends
+                sibling = event == 'start' and element.getparent() is rows
+                if previous is not None and (sibling or element is rows):
+                    yield previous
+                    previous = None
+                    if sibling:
+                        while rows[0] is not element:
+                            del rows[0]
+                if element is rows:
+                    return
+                if event == 'end' and element.tag in ('a', 'b') and element.getparent() is rows:
+                    previous = element
+        if previous is not None:     # the page ended early
+            yield previous
+
+    try:
+        yield from _row_entries(elements())
+    finally:
+        parser.close()
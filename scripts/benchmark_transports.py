@@ -0,0 +1,110 @@
+import importlib.util
+import sys
+spec = importlib.util.spec_from_file_location('mangaupdates', 'mangaupdates/__init__.py')
+mangaupdates = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = mangaupdates
+spec.loader.exec_module(mangaupdates)
+
+from mangaupdates.transport import BACKENDS, FakeSession, make_session
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import gzip
+import multiprocessing
+import time
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    """Serves the same page to every GET, gzipped if accepted"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are sent separately
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        compressed = 'gzip' in self.headers.get('Accept-Encoding', '')
+        body = self.server.gzipped if compressed else self.server.page
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def serve(page, port):
+    """Serves `page` until killed, sending the port it listens on to `port`
+    (a `multiprocessing.Queue`)"""
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    server.daemon_threads = True
+    server.page = page
+    server.gzipped = gzip.compress(page)
+    port.put(server.server_address[1])
+    server.serve_forever()
+
+def benchmark(session, url, num_requests, concurrency, parse=False):
+    """Sends `num_requests` GETs to `url` from `concurrency` threads
+
+    Returns:
+        - tuple(float, float): requests/sec, and CPU ms/request of this
+            process (the server runs in another one)
+    """
+
+    def fetch(i):
+        if parse:
+            mangaupdates.Series(33, session=session).populate()
+        else:
+            response = session.get(url, params={'id': 33})
+            response.raise_for_status()
+            response.content
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        list(executor.map(fetch, range(concurrency)))   # warm up: open the connections
+        start, cpu_start = time.perf_counter(), time.process_time()
+        list(executor.map(fetch, range(num_requests)))
+        elapsed, cpu = time.perf_counter() - start, time.process_time() - cpu_start
+    return num_requests / elapsed, 1000 * cpu / num_requests
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Compares the transport backends on requests/sec and CPU per request, '
+                    'against a local server of a series page.')
+    parser.add_argument('-n', '--requests', default=2000,
+                        help='# of requests per backend.')
+    parser.add_argument('-c', '--concurrency', default=8,
+                        help='# of threads sending requests.')
+    parser.add_argument('--page', default='tests/fixtures/series_33.html',
+                        help='page served.')
+    parser.add_argument('--parse', action='store_true',
+                        help='populate a `Series` from each response too.')
+    args = parser.parse_args()
+    num_requests, concurrency = int(args.requests), int(args.concurrency)
+
+    with open(args.page, 'rb') as f:
+        page = f.read()
+    # in its own process, so that its CPU time isn't counted
+    port = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(page, port), daemon=True)
+    server.start()
+    mangaupdates.Series.domain = f'http://127.0.0.1:{port.get()}'
+    url = f'{mangaupdates.Series.domain}/series.html'
+
+    print(f'{num_requests} requests, {concurrency} threads, {len(page)} bytes page')
+    print(f'{"backend":<10}{"requests/s":>12}{"CPU ms/request":>16}')
+    for backend in BACKENDS + ('fake',):
+        if backend == 'fake':
+            session = FakeSession(lambda url, params: page)
+        else:
+            try:
+                session = make_session(concurrency, backend=backend)
+            except ImportError as e:
+                print(f'{backend:<10}(skipped: {e})')
+                continue
+        with session:
+            rate, cpu = benchmark(session, url, num_requests, concurrency, args.parse)
+        print(f'{backend:<10}{rate:>12.0f}{cpu:>16.3f}')
+    server.terminate()
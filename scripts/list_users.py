@@ -5,22 +5,135 @@ mangaupdates = importlib.util.module_from_spec(spec)
 sys.modules[spec.name] = mangaupdates
 spec.loader.exec_module(mangaupdates)
 
-from mangaupdates import Series, ListStats
+from mangaupdates import Series, ListStats, exceptions
+from mangaupdates.cache import CachedSession, FileCache
+from mangaupdates.ratelimit import (AdaptiveLimiter, AdaptiveSession, RateLimitedSession,
+                                    RateLimiter)
+from mangaupdates.retry import CircuitBreaker, RetrySession, report_breaker
+from mangaupdates.transport import BACKENDS, make_session
+from concurrent.futures import ProcessPoolExecutor
 import csv
 import pandas as pd
+import queue
+import threading
 import time
 import os
 import os.path
 import argparse
 import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 
 MAX_RETRIES = 5
-CONNECTION_ERROR_DELAY = 90
 
 
-def make_dataset(series_ids, filename=None, delay=10, list_names=None, mode='n'):
+def fetch_lists(sid, list_names, session):
+    """Downloads the list webpages of series `sid` ({list name: bytes}). The
+    session retries the failed requests; while its circuit breaker is open
+    (the site seems to be down), waits until it lets requests through again.
+    """
+
+    url = f'{ListStats.domain}/series.html'
+    while True:
+        try:
+            pages = {}
+            for list_name in list_names:
+                response = session.get(url, params={'act': 'list', 'sid': sid, 'list': list_name})
+                response.raise_for_status()
+                pages[list_name] = response.content
+            return pages
+        except exceptions.CircuitOpenError as e:
+            time.sleep(max(e.retry_in, 1))
+
+def parse_lists(sid, pages):
+    """Rows of the lists of series `sid` ({list name: [row, ...]}). Runs in
+    the process pool, so only the raw pages and the rows cross processes.
+    """
+
+    lists = ListStats.from_html(sid, pages)
+    return {key: [(val.user_id, val.username, val.rating, key, sid) for val in lists.general_list(key)]
+            for key in pages}
+
+def pipeline(series_ids, list_names, session, fetchers=4, parsers=None, window=16):
+    """Fetches and parses the lists of `series_ids` in stages:
+        - `fetchers` threads download the pages (as fast as `session` allows,
+          see `make_dataset`),
+        - a pool of `parsers` processes (default: one per core) parses them,
+        - the caller consumes the rows, in the order of `series_ids`.
+    At most `window` series are between the first and the last stage at once,
+    so a slow stage makes the others wait instead of piling up pages or rows.
+
+    Yields:
+        (sid, {list name: [row, ...]}): or (sid, None) if it was skipped
+    """
+
+    ids = enumerate(series_ids)
+    ids_lock = threading.Lock()
+    slots = threading.Semaphore(window)
+    stop = threading.Event()
+    events = queue.Queue()  # ('fetched'|'parsed'|'done', index, sid, value)
+
+    def fetcher():
+        try:
+            while True:
+                slots.acquire()
+                if stop.is_set():
+                    break
+                with ids_lock:
+                    index, sid = next(ids, (None, None))
+                if index is None:
+                    break
+                try:
+                    pages = fetch_lists(sid, list_names, session)
+                except Exception as e:  # any error skips the series (and not the rest)
+                    pages = e
+                events.put(('fetched', index, sid, pages))
+        finally:
+            events.put(('done', None, None, None))
+
+    def parsed(index, sid, future):
+        events.put(('parsed', index, sid, future))
+
+    with ProcessPoolExecutor(parsers) as pool:
+        threads = [threading.Thread(target=fetcher, daemon=True) for _ in range(fetchers)]
+        for thread in threads:
+            thread.start()
+
+        done = {}   # index -> (sid, rows), waiting for the previous ones
+        next_index = fetched = 0
+        running = fetchers
+        try:
+            while running or next_index < fetched:   # until every fetched series is yielded
+                kind, index, sid, value = events.get()
+                fetched += kind == 'fetched'
+                if kind == 'done':
+                    running -= 1
+                    continue
+                elif kind == 'fetched' and isinstance(value, dict):
+                    future = pool.submit(parse_lists, sid, value)
+                    future.add_done_callback(lambda future, index=index, sid=sid: parsed(index, sid, future))
+                    continue
+                elif kind == 'parsed':
+                    try:
+                        value = value.result()
+                    except Exception as e:
+                        print('Skipping', sid, f'({e!r})')
+                        value = None
+                else:
+                    print('Skipping', sid, f'({value!r})')
+                    value = None
+                done[index] = (sid, value)
+
+                while next_index in done:
+                    yield done.pop(next_index)
+                    next_index += 1
+                    slots.release()
+        finally:
+            stop.set()
+            for _ in threads:
+                slots.release()
+            pool.shutdown(cancel_futures=True)
+
+def make_dataset(series_ids, filename=None, delay=10, list_names=None, mode='n',
+                 fetchers=4, parsers=None, cache=None, backend='requests'):
 
     col_names = ('user_id', 'username', 'score', 'list_name', 'series_id')
     resuming = False
@@ -69,27 +182,29 @@ def make_dataset(series_ids, filename=None, delay=10, list_names=None, mode='n')
         list_names = ('read', 'wish', 'unfinished', 'complete', 'hold')
     print('Lists:', list_names)
 
-    sess = requests.Session()
-    retries = Retry(total=MAX_RETRIES, backoff_factor=3)
-    sess.mount('http://', HTTPAdapter(max_retries=retries))
+    sess = make_session(fetchers, backend=backend)
+    # up to `fetchers` requests at once, fewer while the site is throttling
+    limiter = AdaptiveLimiter(max_limit=fetchers)
+    sess = AdaptiveSession(limiter, sess)
+    # on average one series every `delay` seconds, counting the time spent on
+    # the requests (the lists of a series can be requested back to back);
+    # under the retries, so that each attempt takes a token
+    if delay:
+        sess = RateLimitedSession(RateLimiter(rate=len(list_names) / delay,
+                                              burst=len(list_names)), sess)
+    sess = RetrySession(sess, retries=MAX_RETRIES, backoff=3,
+                        breaker=CircuitBreaker(on_change=report_breaker))
+    if cache is not None:
+        sess = CachedSession(cache, sess)
     loaded = False
+    sid = None
     try:
-        for i, sid in enumerate(series_ids):
+        for i, (sid, lists) in enumerate(pipeline(series_ids, list_names, sess,
+                                                  fetchers, parsers)):
             loaded = False
-            lists = ListStats(sid, session=sess)
-            print(sid, end='\t\t', flush=True)
-            for _ in range(MAX_RETRIES):
-                try:
-                    lists.populate(list_names=list_names)
-                    break
-                except requests.exceptions.ConnectionError as e:
-                    print(e)
-                    print('Retrying...')
-                    time.sleep(CONNECTION_ERROR_DELAY)
-            else:       # no break
-                print('Skipping', sid, '(exceeded MAX_RETRIES)')
+            if lists is None:
                 continue
-
+            print(sid, f'(limit {limiter.limit})', end='\t', flush=True)
 
             for key in list_names:
                 if resuming and i == 0:
@@ -104,14 +219,13 @@ def make_dataset(series_ids, filename=None, delay=10, list_names=None, mode='n')
                     # Thus, we assume that if the last entry on the file has
                     # some series id `last_sid` and list name `last_list_name`, we
                     # can simply skip all entries before that.
-                new_rows = [(val.user_id, val.username, val.rating, key, sid) for val in lists.general_list(key)]
+                new_rows = lists[key]
                 print(key, f'{len(new_rows)} rows.', sep='\t')
                 if filename is None:
                     rows.extend(new_rows)
                 else:
                     writer.writerows(new_rows)
             loaded = True
-            time.sleep(delay)
     except (KeyboardInterrupt, requests.exceptions.ConnectionError) as e:
         print('\n', e, sep='')
         if loaded:
@@ -151,8 +265,17 @@ if __name__ == '__main__':
                         help="equivalent to mode='a'. resumes progress if stopped"
                         " previously. overrides --force.")
     parser.add_argument('-d', '--delay', default=10,
-                        help='# of seconds of delay between GET requests.')
+                        help='# of seconds spent on each series on average '
+                             '(requests to the site are rate limited accordingly).')
     parser.add_argument('--listnames', default='rwuch')
+    parser.add_argument('--fetchers', default=4,
+                        help='max # of threads downloading pages at once.')
+    parser.add_argument('--parsers', default=None,
+                        help='# of processes parsing pages (default: # of cores).')
+    parser.add_argument('--cache', default=None,
+                        help='directory where downloaded pages are cached.')
+    parser.add_argument('--backend', default='requests', choices=BACKENDS,
+                        help='HTTP client sending the requests.')
     args = parser.parse_args()
 
     list_names = ['read']
@@ -203,5 +326,7 @@ if __name__ == '__main__':
             if sid not in series_ids:
                 series_ids.append(sid)
 
-    make_dataset(series_ids, filename=args.output, delay=args.delay, mode=mode,
-                 list_names=list_names)
+    make_dataset(series_ids, filename=args.output, delay=float(args.delay), mode=mode,
+                 list_names=list_names, fetchers=int(args.fetchers),
+                 parsers=args.parsers and int(args.parsers),
+                 cache=args.cache and FileCache(args.cache), backend=args.backend)
@@ -0,0 +1,69 @@
+import importlib.util
+import sys
+spec = importlib.util.spec_from_file_location('mangaupdates', 'mangaupdates/__init__.py')
+mangaupdates = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = mangaupdates
+spec.loader.exec_module(mangaupdates)
+
+from mangaupdates.crawl import CrawlState, IncrementalCrawler, listed_counts
+import argparse
+import csv
+
+
+def read_ids(filename, column=0):
+    """Unique series ids in column `column` of the csv file `filename`"""
+
+    series_ids = {}
+    with open(filename, 'r', newline='') as csvfile:
+        for row in csv.reader(csvfile):
+            if row and row[column].isdigit():
+                series_ids[int(row[column])] = None
+    return list(series_ids)
+
+def read_listed(filename):
+    """Numbers of users of the series in the output of `top_lists.py`"""
+
+    with open(filename, 'r', newline='') as csvfile:
+        rows = [(int(row['series_id']), row['series_name'], int(row['num_users']), row['list_name'])
+                for row in csv.DictReader(csvfile)]
+    return listed_counts(rows)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Populates again only the series that changed since the last run, '
+                    'and prints them as JSON lines.')
+    parser.add_argument(metavar='INPUT', dest='input',
+                        help='csv file containing series ids.')
+    parser.add_argument(metavar='STATE', dest='state',
+                        help='SQLite file where the state of the series is kept.')
+    parser.add_argument('-c', '--column', default=0,
+                        help='column (0-indexed) of series id.')
+    parser.add_argument('--listed', default=None,
+                        help='csv file output by top_lists.py (e.g. from today), used to '
+                             'skip the series whose numbers of users did not change.')
+    parser.add_argument('--max-age', dest='max_age', default=30,
+                        help='# of days after which a series is crawled again anyway.')
+    parser.add_argument('--workers', default=4,
+                        help='# of threads downloading series.')
+    args = parser.parse_args()
+
+    series_ids = read_ids(args.input, int(args.column))
+    listed = read_listed(args.listed) if args.listed else None
+
+    state = CrawlState(args.state)
+    crawler = IncrementalCrawler(state, max_age=float(args.max_age) * 24 * 60 * 60,
+                                 parser='lxml')
+    crawled = 0
+    for sid, series in crawler.crawl(series_ids, listed, workers=int(args.workers),
+                                     retain_html=False):
+        try:
+            if isinstance(series, Exception):
+                raise series
+            print(series.json())
+            crawled += 1
+        except Exception as e:
+            print('Skipping', sid, f'({e!r})', file=sys.stderr)
+    print(f'{crawled} crawled, {crawler.skipped} skipped, {crawler.probed} probed '
+          f'(of {len(series_ids)})', file=sys.stderr)
+    state.close()
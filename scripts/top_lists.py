@@ -5,9 +5,11 @@ mangaupdates = importlib.util.module_from_spec(spec)
 sys.modules[spec.name] = mangaupdates
 spec.loader.exec_module(mangaupdates)
 
+from mangaupdates.cache import CachedSession, FileCache
+from mangaupdates.ratelimit import RateLimitedSession, RateLimiter
+from mangaupdates import exceptions
+from mangaupdates.retry import CircuitBreaker, RetrySession, report_breaker
 import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import argparse
 import time
@@ -15,7 +17,7 @@ import csv
 import os
 
 
-def get_most_listed(min_num_users=1, first_page=1, max_pages=None, delay=10, list_names=None, filename=None, MAX_RETRIES=5, force=False):
+def get_most_listed(min_num_users=1, first_page=1, max_pages=None, delay=10, list_names=None, filename=None, MAX_RETRIES=5, force=False, cache=None):
     """Extracts most-listed series on the site.
 
     Arguments:
@@ -25,13 +27,17 @@ def get_most_listed(min_num_users=1, first_page=1, max_pages=None, delay=10, lis
         num_pages (int): The max number of pages to iterate over
                          (overrides min_num_users if not `None`)
                          Default is `None`
-        delay (int):     the number of secs delay after each GET request
+        delay (int):     the number of secs between GET requests (counting
+                         the time spent on them)
         list_names ([str, str,...]):
                          The names of the lists to be searched
                          must be a subset of {'read', 'wish', 'unfinished'}
         filename (str): path to the file to which the function will export the
                         extracted list of tuples as a `.csv` file.
                         If `None` (default), the list will not be exported.
+        cache (mangaupdates.cache.Cache):
+                         pages are read from/stored in this cache (the pages
+                         read from it don't count for `delay`). Default is `None`
     Returns:
         [(series_id, series_name, num_users, list_name), ...]
     """
@@ -56,9 +62,12 @@ def get_most_listed(min_num_users=1, first_page=1, max_pages=None, delay=10, lis
     else:
         lists = []
 
-    sess = requests.Session()
-    retries = Retry(total=MAX_RETRIES, backoff_factor=3)
-    sess.mount('http://', HTTPAdapter(max_retries=retries))
+    # rate-limited under the retries, so that each attempt takes a token
+    sess = RateLimitedSession(RateLimiter(rate=1 / delay)) if delay else None
+    sess = RetrySession(sess, retries=MAX_RETRIES, backoff=3,
+                        breaker=CircuitBreaker(on_change=report_breaker))
+    if cache is not None:
+        sess = CachedSession(cache, sess)
     for list_name in list_names:
         page = first_page
         num_users = min_num_users   # just to pass through first iteration
@@ -68,20 +77,18 @@ def get_most_listed(min_num_users=1, first_page=1, max_pages=None, delay=10, lis
                       'perpage': 100,
                       'page': page}
 
-            for _ in range(MAX_RETRIES):
-                try:
-                    print('Requesting', repr(list_name), 'page', params['page'], end='\t', flush=True)
-                    response = sess.get(url, params=params)
-                    response.raise_for_status()
-                    break
-                except requests.exceptions.ConnectionError as e:
-                    print(e)
-                    time.sleep(120)
-                    print('Retrying...')
-            else:       # no break
-                print('Skipping page', page, '(exceeded MAX_RETRIES)')
+            try:
+                print('Requesting', repr(list_name), 'page', params['page'], end='\t', flush=True)
+                response = sess.get(url, params=params)
+                response.raise_for_status()
+            except exceptions.CircuitOpenError as e:
+                print(e)
+                time.sleep(max(e.retry_in, 1))
+                continue
+            except requests.exceptions.RequestException as e:
+                print('Skipping page', page, f'({e!r})')
+                page += 1
                 continue
-            time.sleep(delay)
 
             soup = BeautifulSoup(response.content, 'lxml')
             table = soup.find(id='main_content').find('div', class_='row no-gutters')
@@ -135,6 +142,8 @@ if __name__ == '__main__':
                         help='overwrite output file if it exists')
     parser.add_argument('-a', '--append', action='store_true',
                         help='append new lines to the CSV file instead of overwriting')
+    parser.add_argument('--cache', default=None,
+                        help='directory where downloaded pages are cached.')
     args = parser.parse_args()
 
     if os.path.isfile(args.output):
@@ -163,4 +172,5 @@ if __name__ == '__main__':
         exit(-1)
 
     get_most_listed(first_page=int(args.start_page), max_pages=int(args.max_pages),
-                    list_names=list_names, filename=args.output, force=args.force)
+                    list_names=list_names, filename=args.output, force=args.force,
+                    cache=args.cache and FileCache(args.cache))
@@ -0,0 +1,193 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import hashlib
+import io
+import json
+import os.path
+import threading
+import time
+import pytest
+import requests
+
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+SERIES_FIELDS = ('title', 'description', 'series_type', 'related_series',
+                 'associated_names', 'groups_scanlating', 'latest_releases',
+                 'status', 'completely_scanlated', 'anime_chapters',
+                 'user_reviews', 'forum', 'user_rating', 'last_updated',
+                 'image', 'genres', 'categories', 'category_recommendations',
+                 'recommendations', 'authors', 'artists', 'year',
+                 'original_publisher', 'serialized_in', 'licensed_in_english',
+                 'english_publisher', 'activity_stats', 'list_stats')
+
+
+def fixture_bytes(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+class RawBody(io.BytesIO):
+    """Streamed response body that remembers how much of it was read"""
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.bytes_read = self.tell()
+        return data
+
+def load_snapshot(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return json.load(f)
+
+def make_response(content, url='', status_code=200, encoding='utf-8', stream=False):
+    response = requests.Response()
+    if stream:
+        response.raw = RawBody(content)
+        response.raw.bytes_read = 0
+    else:
+        response._content = content
+        response._content_consumed = True
+    response.status_code = status_code
+    response.url = url
+    response.encoding = encoding
+    response.headers['Content-Type'] = f'text/html; charset={encoding}'
+    return response
+
+def snapshot(series, fields=SERIES_FIELDS):
+    """repr() of the public Series properties, generators expanded to lists"""
+
+    values = {}
+    for name in fields:
+        value = getattr(series, name)
+        if name in ('related_series', 'associated_names', 'groups_scanlating',
+                    'latest_releases', 'user_reviews', 'genres', 'categories',
+                    'category_recommendations', 'recommendations', 'authors',
+                    'artists', 'serialized_in', 'english_publisher'):
+            value = list(value)
+        values[name] = repr(value)
+    return values
+
+
+class FixtureSession:
+    """Stand-in for `requests.Session` that serves pages from tests/fixtures"""
+
+    def __init__(self, pages):
+        # {series id: fixture file name, (series id, list name): fixture file name}
+        self.pages = pages
+        self.requests = []
+
+    def get(self, url, params=None, stream=False, **kwargs):
+        self.requests.append((url, dict(params)))
+        key = (params['sid'], params['list']) if 'list' in params else params['id']
+        self.response = make_response(fixture_bytes(self.pages[key]), url=url, stream=stream)
+        return self.response
+
+
+@pytest.fixture
+def fixture_session():
+    return FixtureSession({33: 'series_33.html', 113682: 'series_sparse.html',
+                           (33, 'read'): 'list_33_read.html',
+                           (33, 'wish'): 'list_33_empty.html'})
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local HTTP server that serves the pages of a `FixtureSession` (same
+    `pages` keys, or page bytes as values) at `url` + '/series.html', after
+    `delay` seconds each.
+
+    With `validators`, pages are sent with an ETag (their SHA-1) and a
+    Last-Modified header, and conditional requests for unchanged pages get a
+    304. With `throttle_above`, requests that arrive while more than that many
+    are in flight get a 429 (with `Retry-After: <retry_after>`, if given).
+    Counts the requests it receives (`not_modified`: the 304s, `throttled`:
+    the 429s) and the most it had in flight at once.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, pages, delay=0, validators=False, throttle_above=None, retry_after=None):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.pages = pages
+        self.delay = delay
+        self.validators = validators
+        self.throttle_above = throttle_above
+        self.retry_after = retry_after
+        self.requests = []
+        self.not_modified = self.throttled = 0
+        self.in_flight = self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.url = f'http://127.0.0.1:{self.server_address[1]}'
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            throttled = server.throttle_above is not None and server.in_flight > server.throttle_above
+            server.throttled += throttled
+        try:
+            time.sleep(server.delay)
+            if throttled:
+                self.send_response(429)
+                if server.retry_after is not None:
+                    self.send_header('Retry-After', str(server.retry_after))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.respond(urlparse(self.path))
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def respond(self, url):
+        params = {key: value[0] for key, value in parse_qs(url.query).items()}
+        if 'list' in params:
+            key = (int(params['sid']), params['list'])
+        else:
+            key = int(params.get('id', 0))
+        if url.path != '/series.html' or key not in self.server.pages:
+            self.send_error(404)
+            return
+
+        body = self.server.pages[key]
+        if isinstance(body, str):
+            body = fixture_bytes(body)
+        if self.server.validators:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if self.headers.get('If-None-Match') == etag:
+                with self.server.lock:
+                    self.server.not_modified += 1
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+        self.send_response(200)
+        if self.server.validators:
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', 'Mon, 18 Jan 2021 13:48:00 GMT')
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def stub_server():
+    with StubServer({33: 'series_33.html', 113682: 'series_sparse.html',
+                     (33, 'read'): 'list_33_read.html',
+                     (33, 'wish'): 'list_33_empty.html'}) as server:
+        yield server
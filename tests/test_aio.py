@@ -0,0 +1,88 @@
+import asyncio
+import time
+import pytest
+from mangaupdates import Series, ListStats
+from mangaupdates.ratelimit import RateLimiter
+from .conftest import StubServer, fixture_bytes, snapshot
+
+aiohttp = pytest.importorskip('aiohttp')
+from mangaupdates.aio import AsyncSeries, AsyncListStats, fetch_series_many
+
+
+@pytest.fixture(autouse=True)
+def local_domain(monkeypatch, stub_server):
+    monkeypatch.setattr(Series, 'domain', stub_server.url)
+    monkeypatch.setattr(ListStats, 'domain', stub_server.url)
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_async_series(parser):
+    series = AsyncSeries(33, parser=parser)
+    asyncio.run(series.populate())
+    # same values as the snapshot, except for `domain`
+    assert snapshot(series) == snapshot(Series.from_html(33, fixture_bytes('series_33.html')))
+    assert all(isinstance(rec.series, AsyncSeries) for rec in series.recommendations)
+    assert isinstance(series.list_stats, AsyncListStats)
+    assert series.list_stats._parser == series._parser == parser
+
+def test_async_series_shared_session(stub_server):
+    async def main():
+        async with aiohttp.ClientSession() as session:
+            series = AsyncSeries(33, session=session)
+            await series.populate(fields=['title', 'genres'])
+            assert next(series.related_series).series.session is session
+            return series
+    series = asyncio.run(main())
+    assert series.title == 'One Piece'
+    assert stub_server.requests == ['/series.html?id=33']
+
+def test_async_series_fetch_many():
+    with pytest.raises(TypeError, match='fetch_series_many'):
+        AsyncSeries.fetch_many([33])
+
+def test_async_liststats():
+    list_stats = AsyncListStats(33)
+    asyncio.run(list_stats.populate(delay=0, list_names=['read', 'wish']))
+    expected = ListStats.from_html(33, {'read': fixture_bytes('list_33_read.html'),
+                                        'wish': fixture_bytes('list_33_empty.html')})
+    assert list(list_stats.reading) == list(expected.reading)
+    assert list_stats.json() == expected.json()
+
+def test_async_liststats_limiter(monkeypatch):
+    limiter = RateLimiter(rate=100)
+    waits = []
+    wait = limiter.wait
+    async def counting_wait():
+        waits.append(await wait())
+    monkeypatch.setattr(limiter, 'wait', counting_wait)
+    sleeps = []
+    sleep = asyncio.sleep
+    async def recording_sleep(seconds, result=None):
+        sleeps.append(seconds)
+        await sleep(0)
+    monkeypatch.setattr(asyncio, 'sleep', recording_sleep)
+    list_stats = AsyncListStats(33)
+    asyncio.run(list_stats.populate(delay=30, list_names=['read', 'wish'], limiter=limiter))
+    assert len(waits) == 2
+    assert 30 not in sleeps     # the limiter spaces out the requests instead of `delay`
+
+async def collect(*args, **kwargs):
+    return [result async for result in fetch_series_many(*args, **kwargs)]
+
+def test_fetch_series_many(monkeypatch):
+    with StubServer({id: 'series_33.html' for id in range(1, 41)}, delay=0.05) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        results = asyncio.run(collect(iter(range(1, 43)), concurrency=8, fields=['title']))
+
+    assert sorted(id for id, _ in results) == list(range(1, 43))
+    results = dict(results)
+    assert all(results[id].title == 'One Piece' for id in range(1, 41))
+    for id in (41, 42):
+        assert isinstance(results[id], aiohttp.ClientResponseError)
+        assert results[id].status == 404
+    assert 1 < server.max_in_flight <= 8
+
+def test_fetch_series_many_rate(stub_server):
+    start = time.monotonic()
+    results = asyncio.run(collect([33] * 6, concurrency=6, rate=20))
+    assert time.monotonic() - start >= 5 / 20
+    assert len(results) == 6 and stub_server.max_in_flight <= 6
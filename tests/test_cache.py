@@ -0,0 +1,145 @@
+import os
+import time
+import pytest
+from mangaupdates import ListStats, Series
+from mangaupdates.cache import (CachedResponse, CachedSession, FileCache, SQLiteCache,
+                                cache_key, page_type)
+from .conftest import StubServer, fixture_bytes, snapshot
+
+
+@pytest.fixture(params=['file', 'sqlite'])
+def make_cache(request, tmp_path):
+    def make_cache(**kwargs):
+        if request.param == 'file':
+            return FileCache(tmp_path / 'cache', **kwargs)
+        return SQLiteCache(str(tmp_path / 'cache.sqlite'), **kwargs)
+    return make_cache
+
+@pytest.fixture
+def server(stub_server, monkeypatch):
+    monkeypatch.setattr(Series, 'domain', stub_server.url)
+    monkeypatch.setattr(ListStats, 'domain', stub_server.url)
+    return stub_server
+
+def test_page_type_and_key():
+    url = 'https://www.mangaupdates.com/series.html'
+    assert page_type(url, {'id': 33}) == 'series'
+    assert page_type(url, {'act': 'list', 'sid': 33, 'list': 'read'}) == 'list'
+    assert page_type('https://www.mangaupdates.com/stats.html', {'page': 2}) == 'stats'
+    assert page_type('https://www.mangaupdates.com/', {}) is None
+    assert cache_key(url, {'sid': 33, 'act': 'list'}) == cache_key(url, {'act': 'list', 'sid': '33'})
+    assert cache_key(url) == url
+
+def test_cached_series(server, make_cache):
+    expected = snapshot(Series.from_html(33, fixture_bytes('series_33.html')))
+    session = CachedSession(make_cache())
+    for _ in range(3):
+        series = Series(33, session=session, parser='lxml')
+        series.populate()
+        assert snapshot(series) == expected
+    series.populate(fields=['title'], stream=True)
+    assert series.title == 'One Piece'
+
+    assert len(server.requests) == 1
+    assert (session.cache.hits, session.cache.misses) == (3, 1)
+
+    # stored across instances
+    session = CachedSession(make_cache())
+    Series(33, session=session).populate()
+    assert len(server.requests) == 1 and session.cache.hits == 1
+
+def test_cached_lists(server, make_cache):
+    session = CachedSession(make_cache())
+    expected = ListStats(33)
+    expected.populate(delay=0, list_names=['read', 'wish'])
+    for _ in range(2):
+        list_stats = ListStats(33, session=session)
+        list_stats.populate(delay=0, list_names=['read', 'wish'])
+        assert list_stats.json() == expected.json()
+    assert list(list_stats.stream_list('read', chunk_size=10)) == list(expected.reading)
+    assert len(server.requests) == 2 + 2
+
+def test_errors_not_cached(server, make_cache):
+    session = CachedSession(make_cache())
+    for _ in range(2):
+        response = session.get(f'{server.url}/series.html', params={'id': 98})
+        assert response.status_code == 404 and not response.from_cache
+    assert len(server.requests) == 2
+
+def test_ttl(make_cache):
+    cache = make_cache(ttls={'series': 60})
+    cache.set('a', CachedResponse('a', b'series', stored=time.time() - 120))
+    cache.set('b', CachedResponse('b', b'list', stored=time.time() - 120))
+    assert cache.get('a', 'series') is None
+    assert cache.get('b', 'list').content == b'list'
+    assert cache.get('a', 'series') is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_lru_eviction_and_compression(make_cache):
+    page = fixture_bytes('series_33.html')
+    cache = make_cache(max_size=len(page))
+    for key in 'abc':
+        cache.set(key, CachedResponse(key, page))
+    assert cache.get('a') is not None   # compressed, so all fit
+    cache.set('d', CachedResponse('d', os.urandom(len(page) // 2)))
+    assert cache.get('b') is None
+    assert cache.get('a').content == page
+    assert cache.get('d') is not None
+
+@pytest.fixture
+def count_loads(monkeypatch):
+    loads = []
+    load = Series._load
+
+    def counting_load(self, *args):
+        loads.append(self.id)
+        return load(self, *args)
+
+    monkeypatch.setattr(Series, '_load', counting_load)
+    return loads
+
+@pytest.mark.parametrize('validators', [True, False])
+def test_revalidation(monkeypatch, make_cache, count_loads, validators):
+    with StubServer({33: 'series_33.html'}, validators=validators) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        session = CachedSession(make_cache(ttls={'series': 0}))
+        series = Series(33, session=session)
+        for _ in range(3):
+            series.populate()
+            assert series.title == 'One Piece'
+        assert len(server.requests) == 3
+        assert server.not_modified == (2 if validators else 0)
+        assert session.cache.revalidated == 2
+        assert count_loads == [33]
+
+        server.pages[33] = 'series_sparse.html'
+        series.populate()
+        assert series.title != 'One Piece'
+        assert server.not_modified == (2 if validators else 0)
+        assert session.cache.revalidated == 2
+        assert count_loads == [33, 33]
+
+def test_unchanged_page_not_parsed_again(fixture_session, count_loads, make_cache):
+    series = Series(33, session=CachedSession(make_cache(), fixture_session))
+    series.populate()
+    genres = series.genres
+    series.populate(retain_html=False)
+    assert count_loads == [33]
+    assert '_entries' not in series.__dict__ and list(series.genres) == list(genres)
+    # revalidating a frozen series doesn't bring its webpage back
+    series.populate(retain_html=False)
+    assert '_response' not in series.__dict__ and '_entries' not in series.__dict__
+    assert count_loads == [33]
+    series.populate(fields=['title'])
+    assert count_loads == [33, 33]
+    assert len(fixture_session.requests) == 1
+
+    # the digest belongs to the instance: a new one parses the page
+    Series(33, session=series.session).populate(fields=['title'])
+    assert count_loads == [33, 33, 33]
+
+    # without the cache, pages are always parsed
+    series = Series(33, session=fixture_session)
+    series.populate()
+    series.populate()
+    assert count_loads == [33, 33, 33, 33, 33]
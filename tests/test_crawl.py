@@ -0,0 +1,89 @@
+import threading
+import time
+import pytest
+from mangaupdates import Series
+from mangaupdates.crawl import CrawlState, IncrementalCrawler, listed_counts
+from mangaupdates.transport import make_session
+from .conftest import StubServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StubServer({id: 'series_33.html' for id in range(1, 11)}) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        yield server
+
+@pytest.fixture
+def state(tmp_path):
+    state = CrawlState(str(tmp_path / 'state.sqlite'))
+    yield state
+    state.close()
+
+def test_listed_counts():
+    rows = [(1, 'a', 10, 'read'), (2, 'b', 9, 'read'), (1, 'a', 3, 'wish')]
+    assert listed_counts(rows) == {1: {'read': 10, 'wish': 3}, 2: {'read': 9}}
+
+def test_incremental_crawl(server, state):
+    ids = range(1, 11)
+    listed = {id: {'read': 100 + id} for id in range(1, 6)}
+    crawler = IncrementalCrawler(state, parser='lxml')
+    results = dict(crawler.crawl(ids, listed, fields=['title']))
+    assert sorted(results) == list(ids) and len(state) == 10
+    record = state.get(1)
+    assert record.last_updated == results[1].last_updated
+    assert record.activity_stats['weekly'] == {'position': 136, 'change': 20}
+    assert record.listed == {'read': 101}
+    server.requests.clear()
+
+    # nothing changed: the listed series are skipped, the others are probed
+    crawler = IncrementalCrawler(state, parser='lxml')
+    assert list(crawler.crawl(ids, listed)) == []
+    assert (crawler.skipped, crawler.probed) == (5, 5)
+    assert len(server.requests) == 5
+
+    # a listed series gained users, an unlisted one was updated
+    listed[2] = {'read': 200}
+    server.pages[8] = 'series_sparse.html'
+    crawler = IncrementalCrawler(state, parser='lxml')
+    assert sorted(id for id, _ in crawler.crawl(ids, listed)) == [2, 8]
+    assert state.get(2).listed == {'read': 200}
+    assert state.get(8).last_updated is None
+
+def test_max_age(server, state):
+    crawler = IncrementalCrawler(state, max_age=60)
+    list(crawler.crawl([1, 2]))
+    record = state.get(1)
+    record.crawled = time.time() - 120
+    state.put(record)
+    assert list(crawler.changed([1, 2], {1: {}, 2: {}})) == [1]
+
+def test_concurrent_probes(state, monkeypatch):
+    pages = {id: 'series_33.html' for id in range(1, 21)}
+    with StubServer(pages, delay=0.1) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        crawler = IncrementalCrawler(state)
+        list(crawler.crawl(range(1, 21), workers=10))
+        server.pages[20] = 'series_sparse.html'
+        server.max_in_flight = 0
+        assert list(crawler.changed(range(1, 21), workers=10)) == [20]
+        # the probes were sent side by side, not one after the other
+        assert crawler.probed == 20 and 5 <= server.max_in_flight <= 10
+
+def test_failed_probe_is_crawled(server, state):
+    crawler = IncrementalCrawler(state)
+    list(crawler.crawl([1]))
+    del server.pages[1]
+    assert isinstance(dict(crawler.crawl([1]))[1], Exception)
+
+def test_failed_probes_release_connections(server, state):
+    crawler = IncrementalCrawler(state, session=make_session(concurrency=2))
+    list(crawler.crawl(range(1, 11), workers=4))
+    server.pages.clear()    # more probes fail than the pool has connections
+    results = {}
+    thread = threading.Thread(target=lambda: results.update(crawler.crawl(range(1, 11), workers=4)),
+                              daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive()
+    assert sorted(results) == list(range(1, 11))
+    assert all(isinstance(error, Exception) for error in results.values())
@@ -0,0 +1,47 @@
+import time
+import pytest
+import requests
+from mangaupdates import Series
+from .conftest import StubServer
+
+
+@pytest.fixture
+def server(monkeypatch):
+    with StubServer({id: 'series_33.html' for id in range(1, 31)}, delay=0.05) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        yield server
+
+@pytest.mark.parametrize('ordered', [False, True])
+def test_fetch_many(server, ordered):
+    ids = [*range(1, 31), 98, 99]
+    results = list(Series.fetch_many(iter(ids), workers=6, ordered=ordered,
+                                     fields=['title'], parser='lxml'))
+
+    if ordered:
+        assert [id for id, _ in results] == ids
+    else:
+        assert sorted(id for id, _ in results) == ids
+    results = dict(results)
+    assert all(results[id].title == 'One Piece' for id in range(1, 31))
+    for id in (98, 99):
+        assert isinstance(results[id], requests.HTTPError)
+        assert results[id].response.status_code == 404
+    assert 1 < server.max_in_flight <= 6
+
+def test_fetch_many_completion_order(server):
+    server.delay = 0
+
+    class SlowFirst(Series):
+        def populate(self, **kwargs):
+            if self.id == 1:
+                time.sleep(0.2)
+            super().populate(**kwargs)
+
+    results = list(SlowFirst.fetch_many([1, 2, 3], workers=3))
+    assert [id for id, _ in results][-1] == 1
+    assert all(isinstance(series, SlowFirst) for _, series in results)
+
+def test_fetch_many_shared_session(server):
+    session = requests.Session()
+    results = Series.fetch_many(range(1, 5), workers=2, session=session, fields=[])
+    assert all(series.session is session for _, series in results)
@@ -0,0 +1,69 @@
+import gc
+import tracemalloc
+import pytest
+from mangaupdates import Series, exceptions
+from .conftest import FixtureSession, load_snapshot, snapshot
+
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_frozen_series_matches_snapshot(fixture_session, parser):
+    series = Series(33, session=fixture_session, parser=parser)
+    series.populate()
+    expected_json = series.json()
+    series.freeze()
+
+    for attribute in ('_response', '_main_content', '_entries'):
+        assert attribute not in series.__dict__
+    assert snapshot(series) == load_snapshot('series_33.snapshot.json')
+    # generators can still be consumed more than once
+    assert snapshot(series) == load_snapshot('series_33.snapshot.json')
+    assert series.json() == expected_json
+
+def test_populate_retain_html(fixture_session):
+    series = Series(33, session=fixture_session)
+    series.populate(retain_html=False)
+    assert '_entries' not in series.__dict__
+    assert next(series.genres) == 'Action'
+
+    series.populate()
+    assert '_entries' in series.__dict__
+    assert '_generated' not in series.__dict__
+
+def test_freeze_with_fields(fixture_session):
+    series = Series(33, session=fixture_session)
+    series.populate(fields=['genres', 'year'], retain_html=False)
+    assert list(series.genres) == ['Action', 'Adventure', 'Comedy', 'Drama', 'Fantasy', 'Shounen']
+    assert series.year == '1997'
+    with pytest.raises(exceptions.UnpopulatedError):
+        series.status
+    with pytest.raises(exceptions.UnpopulatedError):
+        list(series.authors)
+
+def test_freeze_unpopulated():
+    with pytest.raises(exceptions.UnpopulatedError):
+        Series(33).freeze()
+
+def per_instance_memory(retain_html, n=10):
+    """Bytes allocated (and still held) per populated Series"""
+
+    session = FixtureSession({33: 'series_33.html'})
+    Series(33, session=session).populate(retain_html=retain_html)   # warm up imports/caches
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        series = []
+        for _ in range(n):
+            series.append(Series(33, session=session))
+            series[-1].populate(retain_html=retain_html)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return (after - before) / n
+
+def test_freeze_memory():
+    retained = per_instance_memory(retain_html=True)
+    frozen = per_instance_memory(retain_html=False)
+    print(f'per Series: {retained / 1024:.0f} KiB retained, {frozen / 1024:.0f} KiB frozen')
+    assert frozen < retained / 3
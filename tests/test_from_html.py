@@ -0,0 +1,65 @@
+import pickle
+import pytest
+from mangaupdates import Series, ListStats, exceptions
+from .conftest import fixture_bytes, load_snapshot, snapshot
+
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+@pytest.mark.parametrize('sid, name', [(33, 'series_33'),
+                                       (113682, 'series_sparse')])
+def test_series_from_html(sid, name, parser):
+    content = fixture_bytes(f'{name}.html')
+    series = Series.from_html(sid, content, parser=parser)
+    assert snapshot(series) == load_snapshot(f'{name}.snapshot.json')
+    assert series._session is None     # no request was made
+
+    text = Series.from_html(sid, content.decode('utf-8'), parser=parser)
+    assert snapshot(text) == snapshot(series)
+
+def test_series_from_html_fields():
+    series = Series.from_html(33, fixture_bytes('series_33.html'), fields=['genres'],
+                              retain_html=False)
+    assert list(series.genres) == ['Action', 'Adventure', 'Comedy', 'Drama', 'Fantasy', 'Shounen']
+    with pytest.raises(exceptions.UnpopulatedError):
+        series.year
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_pickle_series(fixture_session, parser):
+    series = Series(33, session=fixture_session, parser=parser, identity_map={})
+    series.populate()
+    data = pickle.dumps(series)
+    assert '_entries' in series.__dict__   # pickling doesn't freeze the series
+
+    unpickled = pickle.loads(data)
+    assert snapshot(unpickled) == load_snapshot('series_33.snapshot.json')
+    assert unpickled.json() == series.json()
+    assert unpickled._session is None and unpickled._identity_map is None
+    assert len(data) < 16 * 1024
+
+def test_pickle_unpopulated_series():
+    series = pickle.loads(pickle.dumps(Series(33, title='One Piece')))
+    assert series.title == 'One Piece'
+    with pytest.raises(exceptions.UnpopulatedError):
+        series.year
+
+def test_liststats_from_html(fixture_session):
+    pages = {'read': fixture_bytes('list_33_read.html'),
+             'wish': fixture_bytes('list_33_empty.html')}
+    list_stats = ListStats.from_html(33, pages)
+    populated = ListStats(33, session=fixture_session)
+    populated.populate(delay=0, list_names=['read', 'wish'])
+
+    assert list(list_stats.reading) == list(populated.reading)
+    assert [entry.username for entry in list_stats.reading][3:] == ['Ærin', 'zoro&co']
+    assert list(list_stats.wish) == []
+    assert list_stats.json() == populated.json()
+    with pytest.raises(exceptions.UnpopulatedError):
+        list_stats.complete
+
+def test_pickle_liststats():
+    pages = {'read': fixture_bytes('list_33_read.html')}
+    list_stats = ListStats.from_html(33, pages, reading_total=5)
+    unpickled = pickle.loads(pickle.dumps(list_stats))
+    assert list(unpickled.reading) == list(list_stats.reading)
+    assert unpickled.json() == list_stats.json()
+    assert repr(unpickled) == repr(list_stats)
@@ -0,0 +1,161 @@
+import gc
+import html
+import random
+import time
+import tracemalloc
+import pytest
+from mangaupdates import ListStats, Series, exceptions, soup, xpath
+from mangaupdates.ratelimit import RateLimiter
+from mangaupdates.series import NO_RATING, UserList
+from mangaupdates.utils import decode_html
+from .conftest import StubServer, fixture_bytes, make_response
+
+
+def list_page(n, list_name='read', seed=0):
+    """List page with `n` entries, about half of them rated"""
+
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        name = html.escape(f'user<{i}>&' if i % 97 == 0 else f'user_{rng.randrange(10**6)}')
+        row = f'<a href=\'javascript:loadUser({i + 1},"{list_name}")\'>{name}</a>'
+        if rng.random() < 0.5:
+            row += f' - Rating: <b>{rng.randrange(1, 101) / 10}</b>'
+        rows.append(row + '<br>\n')
+    return ('<html><head><title>Baka-Updates Manga - Series</title></head><body>'
+            '<p class="text">Users with <b>Series</b> on their list</p>\n'
+            f'<p class="text">{"".join(rows)}</p></body></html>').encode()
+
+def test_lxml_list_entries_match_bs4():
+    pages = {'read': list_page(500), 'wish': fixture_bytes('list_33_empty.html'),
+             'hold': fixture_bytes('list_33_read.html')}
+    soup_stats = ListStats.from_html(33, pages)
+    lxml_stats = ListStats.from_html(33, pages, parser='lxml')
+    for name in ('reading', 'wish', 'on_hold'):
+        assert list(getattr(lxml_stats, name)) == list(getattr(soup_stats, name))
+    assert lxml_stats.json() == soup_stats.json()
+    assert next(lxml_stats.reading).username == 'user<0>&'
+
+def test_list_parser_inherited(fixture_session):
+    series = Series(33, session=fixture_session, parser='lxml')
+    series.populate(fields=['list_stats'])
+    assert series.list_stats._parser == 'lxml'
+    with pytest.raises(ValueError):
+        ListStats(33, parser='html5lib')
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_invalid_list_name(parser):
+    page = b'<html><head><title>Baka-Updates :: Manga :: Info</title></head><body></body></html>'
+    with pytest.raises(exceptions.InvalidListNameError):
+        ListStats.from_html(33, {'asdf': page}, parser=parser)
+
+def test_list_parser_benchmark():
+    page = decode_html(list_page(20000))
+    seconds = {}
+    for backend in (soup, xpath):
+        start = time.perf_counter()
+        entries = list(backend.list_entries(backend.parse_list_page(page, 'read'), 'read'))
+        seconds[backend.__name__] = time.perf_counter() - start
+        assert len(entries) == 20000
+    print(f"20000 entries: bs4 {seconds['mangaupdates.soup']:.2f} s, "
+          f"lxml {seconds['mangaupdates.xpath']:.3f} s")
+    assert seconds['mangaupdates.xpath'] * 10 < seconds['mangaupdates.soup']
+
+def retained(function):
+    """Bytes allocated by `function()` and still held by its result"""
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+def test_list_columns_memory():
+    page = list_page(5000)
+    ListStats.from_html(33, {'read': list_page(10)})    # warm up imports/caches
+    columns, list_stats = retained(lambda: ListStats.from_html(33, {'read': page}))
+    soup_page, _ = retained(lambda: soup.parse_list_page(decode_html(page), 'read'))
+    print(f'5000 entries: {columns / 1024:.0f} KiB in columns, '
+          f'{soup_page / 1024:.0f} KiB as a soup')
+    assert columns * 10 < soup_page
+    assert 'read' not in list_stats.__dict__ and len(list_stats._lists['read']) == 5000
+
+def test_list_columns():
+    entries = UserList()
+    entries.append(1, 'a', 9.5)
+    entries.append(2, ''.join(['a']), None)
+    assert list(entries) == [(1, 'a', 9.5), (2, 'a', None)]
+    assert entries.usernames[0] is entries.usernames[1]
+    assert entries.ratings[1] == NO_RATING
+
+LIST_NAMES = ('read', 'wish', 'unfinished', 'complete', 'hold')
+
+@pytest.fixture
+def list_server(monkeypatch):
+    pages = {(33, list_name): list_page(50, list_name, seed=i)
+             for i, list_name in enumerate(LIST_NAMES)}
+    pages[33, 'wish'] = 'list_33_empty.html'
+    with StubServer(pages, delay=0.2) as server:
+        monkeypatch.setattr(ListStats, 'domain', server.url)
+        yield server
+
+def test_populate_concurrent(list_server):
+    list_stats = ListStats(33, parser='lxml')
+    start = time.monotonic()
+    list_stats.populate(concurrent=True)
+    elapsed = time.monotonic() - start
+    assert list_server.max_in_flight == 5
+    assert elapsed < 0.2 * 3
+
+    expected = ListStats(33)
+    expected.populate(delay=0)
+    assert list(list_stats._lists) == list(LIST_NAMES)
+    assert list_stats.json() == expected.json()
+
+def test_populate_concurrent_limiter(list_server):
+    list_stats = ListStats(33)
+    start = time.monotonic()
+    list_stats.populate(concurrent=True, limiter=RateLimiter(rate=10))
+    assert time.monotonic() - start >= 0.4 + 0.2
+    assert list_server.max_in_flight < 5
+
+class PageSession:
+    """Serves the list page `content` for any list, streamed or not"""
+
+    def __init__(self, content):
+        self.content = content
+
+    def get(self, url, params=None, stream=False, **kwargs):
+        return make_response(self.content, url=url, stream=stream)
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 4096])
+def test_stream_list_matches_general_list(chunk_size):
+    for page in (list_page(300), fixture_bytes('list_33_read.html'),
+                 fixture_bytes('list_33_empty.html')):
+        expected = ListStats.from_html(33, {'read': page})
+        list_stats = ListStats(33, session=PageSession(page))
+        assert (list(list_stats.stream_list('read', chunk_size=chunk_size))
+                == list(expected.general_list('read')))
+
+def test_stream_list_is_incremental():
+    text = list_page(2000).decode()
+    fed = []
+
+    def chunks():
+        for i in range(0, len(text), 100):
+            fed.append(i)
+            yield text[i:i+100]
+
+    entries = xpath.iter_list_entries(chunks(), 'read')
+    assert next(entries)[0] == 1
+    assert len(fed) < 5
+    assert sum(1 for _ in entries) == 1999
+
+def test_stream_list_invalid_list_name():
+    page = b'<html><head><title>Baka-Updates :: Manga :: Info</title></head><body></body></html>'
+    with pytest.raises(exceptions.InvalidListNameError):
+        next(ListStats(33, session=PageSession(page)).stream_list('asdf'))
@@ -0,0 +1,179 @@
+import pytest
+from mangaupdates import Series, exceptions
+from mangaupdates.series import SECTIONS
+from .conftest import fixture_bytes, load_snapshot, make_response, snapshot
+
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+@pytest.mark.parametrize('sid, name', [(33, 'series_33'),
+                                       (113682, 'series_sparse')])
+def test_parsers_match_snapshot(fixture_session, sid, name, parser):
+    series = Series(sid, session=fixture_session, parser=parser)
+    series.populate()
+    assert snapshot(series) == load_snapshot(f'{name}.snapshot.json')
+
+def test_repopulate_refreshes_entries(fixture_session):
+    series = Series(33, session=fixture_session)
+    series.populate()
+    entries = series._entries
+    series.populate()
+    assert series._entries is not entries
+    assert series._entries.keys() == entries.keys()
+
+def test_lxml_entries_match_bs4(fixture_session):
+    soup_series = Series(33, session=fixture_session)
+    soup_series.populate()
+    lxml_series = Series(33, session=fixture_session, parser='lxml')
+    lxml_series.populate()
+    assert list(lxml_series._entries) == list(soup_series._entries)
+    assert lxml_series.json() == soup_series.json()
+
+def test_generator_properties_are_cached(fixture_session, monkeypatch):
+    series = Series(33, session=fixture_session)
+    series.populate()
+    calls = []
+    genres = series._backend.genres
+    monkeypatch.setattr(series._backend, 'genres',
+                        lambda entry: calls.append(entry) or genres(entry))
+
+    assert next(series.genres) == 'Action'
+    assert list(series.genres) == list(series.genres)
+    assert len(calls) == 1
+    assert list(series.recommendations)[0].series is next(series.recommendations).series
+
+    series.populate()
+    assert '_generated' not in series.__dict__
+    list(series.genres)
+    assert len(calls) == 2
+
+def test_iterate_is_lazy(fixture_session):
+    series = Series(33, session=fixture_session)
+    series.populate()
+    assert next(series.iterate('genres')) == 'Action'
+    assert '_generated' not in series.__dict__
+    assert list(series.iterate('authors')) == list(series.authors)
+    with pytest.raises(ValueError):
+        series.iterate('year')
+
+def test_invalid_parser():
+    with pytest.raises(ValueError):
+        Series(33, parser='html5lib')
+
+def test_meta_charset_overrides_header_encoding():
+    page = ('<html><head><meta charset="utf-8"><title>Café</title></head>'
+            '<body><div id="main_content"><span class="releasestitle tabletitle">'
+            'Café</span></div></body></html>').encode('utf-8')
+
+    class Session:
+        def get(self, url, params=None):
+            return make_response(page, encoding='ISO-8859-1')
+
+    series = Series(1, session=Session())
+    series.populate()
+    assert series.title == 'Café'
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+@pytest.mark.parametrize('page, error', [
+    ('<html><head><title>Baka-Updates :: Manga :: Info</title></head>'
+     '<body>You specified an invalid series id.</body></html>',
+     exceptions.InvalidSeriesIDError),
+    ('<html><head><title>Baka-Updates Manga - Series</title></head>'
+     '<body><div id="main_content"><!-- Start:Series Rows --></div></body></html>',
+     exceptions.SeriesIDNotFoundError),
+])
+def test_title_checks(page, error, parser):
+
+    class Session:
+        def get(self, url, params=None):
+            return make_response(page.encode())
+
+    with pytest.raises(error):
+        Series(1, session=Session(), parser=parser).populate()
+    with pytest.raises(error):
+        Series(1, session=Session(), parser=parser).populate(fields=['title'])
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+@pytest.mark.parametrize('sid, name', [(33, 'series_33'),
+                                       (113682, 'series_sparse')])
+def test_projection_matches_snapshot(fixture_session, sid, name, parser):
+    expected = load_snapshot(f'{name}.snapshot.json')
+    for field in SECTIONS:
+        series = Series(sid, session=fixture_session, parser=parser)
+        series.populate(fields=[field])
+        assert snapshot(series, [field]) == {field: expected[field]}
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_projection_parses_requested_sections_only(fixture_session, parser):
+    series = Series(33, session=fixture_session, parser=parser)
+    series.populate(fields=['list_stats', 'user_rating', 'genres'])
+    assert set(series._entries._parsed) == {'List Stats', 'User Rating', 'Genre'}
+    assert set(series._entries) == set(SECTIONS.values()) - {None}
+
+    # unrequested fields are parsed lazily
+    assert series.year == '1997'
+    assert 'Year' in series._entries._parsed
+
+def test_projection_unknown_field(fixture_session):
+    with pytest.raises(ValueError):
+        Series(33, session=fixture_session).populate(fields=['title', 'volumes'])
+
+@pytest.mark.parametrize('parser', ['bs4', 'lxml'])
+def test_stream_stops_after_requested_sections(fixture_session, parser):
+    size = len(fixture_bytes('series_33.html'))
+    expected = load_snapshot('series_33.snapshot.json')
+    fields = ['title', 'series_type', 'status']
+
+    series = Series(33, session=fixture_session, parser=parser)
+    series.populate(fields=fields, stream=True)
+    raw = fixture_session.response.raw
+    assert raw.closed
+    assert raw.bytes_read < size // 2
+    assert snapshot(series, fields) == {field: expected[field] for field in fields}
+
+    # sections further down the page were never downloaded
+    with pytest.raises(exceptions.SectionNotLoadedError):
+        series.list_stats
+
+def test_stream_reads_whole_page_if_needed(fixture_session):
+    expected = load_snapshot('series_33.snapshot.json')
+    series = Series(33, session=fixture_session)
+    series.populate(fields=['list_stats'], stream=True)
+    assert fixture_session.response.raw.bytes_read == len(fixture_bytes('series_33.html'))
+    assert snapshot(series, ['list_stats', 'year']) == {'list_stats': expected['list_stats'],
+                                                        'year': expected['year']}
+
+def test_stream_id_check(fixture_session):
+    series = Series(33, session=fixture_session)
+    series.populate(fields=[], stream=True)
+    assert fixture_session.response.raw.closed
+
+    page = ('<html><head><title>Baka-Updates :: Manga :: Info</title></head>'
+            '<body>You specified an invalid series id.</body></html>')
+
+    class Session:
+        def get(self, url, params=None, stream=False):
+            return make_response(page.encode(), stream=stream)
+
+    with pytest.raises(exceptions.InvalidSeriesIDError):
+        Series(1, session=Session()).populate(fields=[], stream=True)
+
+def test_stream_error_releases_connection(stub_server, monkeypatch):
+    import threading
+    import requests
+    from mangaupdates.transport import make_session
+
+    monkeypatch.setattr(Series, 'domain', stub_server.url)
+    session = make_session(concurrency=2)
+    errors = []
+
+    def populate_missing():
+        for _ in range(5):  # more 404s than the pool has connections
+            try:
+                Series(34, session=session).populate(fields=['last_updated'], stream=True)
+            except requests.exceptions.HTTPError as e:
+                errors.append(e)
+
+    thread = threading.Thread(target=populate_missing, daemon=True)
+    thread.start()
+    thread.join(10)
+    assert not thread.is_alive() and len(errors) == 5
@@ -0,0 +1,179 @@
+from email.utils import formatdate
+import asyncio
+import statistics
+import threading
+import time
+import pytest
+from mangaupdates import ListStats, Series
+from mangaupdates.cache import CachedSession, FileCache
+from mangaupdates.ratelimit import (AdaptiveLimiter, AdaptiveSession, RateLimitedSession,
+                                    RateLimiter, retry_after)
+from .conftest import StubServer, make_response
+
+
+def test_rate_limiter_threads():
+    limiter = RateLimiter(rate=50, burst=5)
+    times = []
+
+    def worker():
+        for _ in range(5):
+            limiter.acquire()
+            times.append(time.monotonic())
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # the first 5 right away, then 50 per second
+    assert len(times) == 20
+    assert time.monotonic() - start >= 15 / 50
+    times.sort()
+    assert times[4] - start < 0.05
+    assert times[-1] - times[5] >= 14 / 50 * 0.9
+
+def test_rate_limiter_refills():
+    limiter = RateLimiter(rate=100)
+    limiter.acquire()
+    time.sleep(0.05)
+    start = time.monotonic()
+    limiter.acquire()
+    assert time.monotonic() - start < 0.01
+
+def test_rate_limiter_arguments():
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+    with pytest.raises(ValueError):
+        RateLimiter(rate=1, burst=0)
+
+def test_rate_limiter_threads_and_coroutines():
+    limiter = RateLimiter(rate=40)
+    times = []
+
+    async def coroutine():
+        for _ in range(4):
+            await limiter.wait()
+            times.append(time.monotonic())
+
+    def worker():
+        for _ in range(4):
+            limiter.acquire()
+            times.append(time.monotonic())
+
+    start = time.monotonic()
+    thread = threading.Thread(target=worker)
+    thread.start()
+    asyncio.run(coroutine())
+    thread.join()
+    assert len(times) == 8
+    assert max(times) - start >= 7 / 40 * 0.9
+
+def test_rate_limited_session(fixture_session):
+    session = RateLimitedSession(RateLimiter(rate=20), fixture_session)
+    start = time.monotonic()
+    series = Series(33, session=session)
+    series.populate(fields=['list_stats'])
+    series.list_stats.populate(list_names=['read', 'wish'])     # no `delay`
+    assert time.monotonic() - start < 1
+    assert time.monotonic() - start >= 2 / 20 * 0.9
+    assert len(fixture_session.requests) == 3
+
+def test_adaptive_session_keeps_delay(fixture_session, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    # it only caps the requests in flight: the pages are still spaced out
+    session = AdaptiveSession(AdaptiveLimiter(), fixture_session)
+    ListStats(33, session=session).populate(delay=1.5, list_names=['read', 'wish'])
+    assert sleeps == [1.5] and len(fixture_session.requests) == 2
+
+    # a rate-limited session does space them out
+    sleeps.clear()
+    session = AdaptiveSession(AdaptiveLimiter(),
+                              RateLimitedSession(RateLimiter(rate=1, burst=2), fixture_session))
+    ListStats(33, session=session).populate(delay=1.5, list_names=['read', 'wish'])
+    assert sleeps == []
+
+def test_cache_hits_not_limited(fixture_session, tmp_path, monkeypatch):
+    limiter = RateLimiter(rate=10)
+    acquired = []
+    acquire = limiter.acquire
+    monkeypatch.setattr(limiter, 'acquire', lambda: acquired.append(acquire()))
+    session = CachedSession(FileCache(tmp_path), RateLimitedSession(limiter, fixture_session))
+    for _ in range(6):
+        Series(33, session=session).populate()
+    assert session.cache.hits == 5 and len(acquired) == 1
+    assert len(fixture_session.requests) == 1
+
+def crawl(session, url, requests, threads=16):
+    """Sends `requests` GETs to series 1-10 of `url` from `threads` threads"""
+
+    ids = iter(range(requests))
+    lock = threading.Lock()
+    statuses = []
+
+    def worker():
+        while True:
+            with lock:
+                i = next(ids, None)
+            if i is None:
+                return
+            response = session.get(f'{url}/series.html', params={'id': i % 10 + 1})
+            statuses.append(response.status_code)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return statuses
+
+PAGES = {id: 'series_sparse.html' for id in range(1, 11)}
+
+def test_adaptive_limiter_increases():
+    # a loaded machine's latency spikes mustn't hold back the increases
+    limiter = AdaptiveLimiter(max_limit=8, latency_tolerance=10)
+    with StubServer(PAGES, delay=0.05) as server:
+        statuses = crawl(AdaptiveSession(limiter), server.url, 150)
+    assert statuses == [200] * 150
+    assert limiter.limit == 8 and limiter.in_flight == 0
+    assert [change.limit for change in limiter.changes] == list(range(2, 9))
+    assert {change.reason for change in limiter.changes} == {'increase'}
+    assert 1 < server.max_in_flight <= 8
+
+def test_adaptive_limiter_backs_off():
+    limiter = AdaptiveLimiter(initial=8, max_limit=16)
+    with StubServer(PAGES, delay=0.02, throttle_above=3) as server:
+        statuses = crawl(AdaptiveSession(limiter), server.url, 200)
+    changes = list(limiter.changes)
+    first = next(i for i, change in enumerate(changes) if change.reason == '429')
+    # the limit saw-tooths around what the server allows (its last value may
+    # be at the top of a tooth)
+    assert statistics.median(change.limit for change in changes[first:]) <= 6
+    assert statuses.count(429) < 50 and statuses[-50:].count(429) < 15
+
+def test_adaptive_limiter_one_decrease_per_window():
+    limiter = AdaptiveLimiter(initial=4, max_limit=4)
+    tokens = [limiter.acquire() for _ in range(4)]
+    for token in tokens:
+        limiter.release(token, congestion='503')
+    assert limiter.limit == 2
+    assert [(change.limit, change.reason) for change in limiter.changes] == [(2, '503')]
+
+def test_adaptive_limiter_retry_after():
+    limiter = AdaptiveLimiter(initial=2)
+    limiter.release(limiter.acquire(), congestion='429', retry_after=0.2)
+    start = time.monotonic()
+    limiter.release(limiter.acquire(), latency=0.01)
+    assert time.monotonic() - start >= 0.19
+
+def test_retry_after_header():
+    response = make_response(b'', status_code=429)
+    assert retry_after(response) is None
+    response.headers['Retry-After'] = '120'
+    assert retry_after(response) == 120
+    response.headers['Retry-After'] = formatdate(time.time() + 60, usegmt=True)
+    assert 55 < retry_after(response) <= 60
+    response.headers['Retry-After'] = 'soon'
+    assert retry_after(response) is None
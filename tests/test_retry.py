@@ -0,0 +1,110 @@
+import time
+import pytest
+import requests
+from mangaupdates import Series, exceptions
+from mangaupdates.ratelimit import RateLimitedSession, RateLimiter
+from mangaupdates.retry import CircuitBreaker, RetrySession, report_breaker
+from .conftest import StubServer, fixture_bytes, make_response
+
+
+class ScriptedSession:
+    """Answers each GET with the next of `outcomes`: a status code, or an
+    exception to raise"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.requests = 0
+
+    def get(self, url, params=None, **kwargs):
+        self.requests += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(fixture_bytes('series_33.html'), url=url, status_code=outcome)
+
+def test_retries_until_success():
+    session = ScriptedSession([503, requests.exceptions.ConnectionError(), 429, 200])
+    response = RetrySession(session, retries=5, backoff=0.01).get('https://example.com/')
+    assert response.status_code == 200 and session.requests == 4
+
+def test_gives_up():
+    session = ScriptedSession([502] * 3)
+    response = RetrySession(session, retries=2, backoff=0.01).get('https://example.com/')
+    assert response.status_code == 502 and session.requests == 3
+
+    session = ScriptedSession([requests.exceptions.Timeout()] * 3)
+    with pytest.raises(requests.exceptions.Timeout):
+        RetrySession(session, retries=2, backoff=0.01).get('https://example.com/')
+
+def test_no_retry_on_client_errors():
+    session = ScriptedSession([404])
+    response = RetrySession(session, retries=2).get('https://example.com/')
+    assert response.status_code == 404 and session.requests == 1
+
+def test_jittered_backoff(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(time, 'sleep', sleeps.append)
+    session = ScriptedSession([500] * 5)
+    RetrySession(session, retries=4, backoff=1, max_backoff=5).get('https://example.com/')
+    assert len(sleeps) == 4
+    assert all(0 <= wait <= min(5, 2**n) for n, wait in enumerate(sleeps))
+    assert len(set(sleeps)) == 4
+
+def test_retry_after(monkeypatch):
+    with StubServer({33: 'series_33.html'}, throttle_above=0, retry_after=0.3) as server:
+        session = RetrySession(retries=1, backoff=0.01)
+        start = time.monotonic()
+        response = session.get(f'{server.url}/series.html', params={'id': 33})
+        assert response.status_code == 429
+        assert time.monotonic() - start >= 0.3
+        assert server.throttled == 2
+
+def test_circuit_breaker():
+    states = []
+    breaker = CircuitBreaker(threshold=3, cooldown=0.2, on_change=states.append)
+    session = ScriptedSession([requests.exceptions.ConnectionError()] * 4 + [200])
+    retrying = RetrySession(session, retries=10, backoff=0.01, breaker=breaker)
+    with pytest.raises(exceptions.CircuitOpenError):
+        retrying.get('https://example.com/')
+    assert session.requests == 3 and states == ['open']
+
+    # fails fast while open, instead of sleeping through its retries
+    start = time.monotonic()
+    with pytest.raises(exceptions.CircuitOpenError) as excinfo:
+        retrying.get('https://example.com/')
+    assert time.monotonic() - start < 0.05 and 0 < excinfo.value.retry_in <= 0.2
+
+    # the trial fails: reopens for twice as long
+    time.sleep(0.2)
+    with pytest.raises(exceptions.CircuitOpenError) as excinfo:
+        retrying.get('https://example.com/')
+    assert states == ['open', 'half-open', 'open'] and excinfo.value.retry_in > 0.2
+
+    time.sleep(0.4)
+    assert retrying.get('https://example.com/').status_code == 200
+    assert states == ['open', 'half-open', 'open', 'half-open', 'closed']
+    assert breaker.state == 'closed'
+
+def test_retries_take_tokens(monkeypatch):
+    limiter = RateLimiter(rate=1000)
+    acquired = []
+    acquire = limiter.acquire
+    monkeypatch.setattr(limiter, 'acquire', lambda: acquired.append(acquire()))
+    session = ScriptedSession([503, 429, 200])
+    retrying = RetrySession(RateLimitedSession(limiter, session), backoff=0.01)
+    assert retrying.get('https://example.com/').status_code == 200
+    assert len(acquired) == session.requests == 3
+    assert retrying.spaces_requests
+
+def test_report_breaker(capsys):
+    breaker = CircuitBreaker(threshold=1, on_change=report_breaker)
+    breaker.failure()
+    assert 'requests are stopped' in capsys.readouterr().out
+
+def test_series_through_retry_session(monkeypatch):
+    with StubServer({33: 'series_33.html'}) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        series = Series(33, session=RetrySession(breaker=CircuitBreaker()))
+        series.populate()
+        assert series.title == 'One Piece'
+        assert series.list_stats.session is series.session
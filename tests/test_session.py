@@ -0,0 +1,62 @@
+import pickle
+from mangaupdates import Series, ListStats
+from .conftest import FixtureSession, fixture_bytes
+
+
+def test_session_created_on_first_request():
+    series = Series(33)
+    assert series._session is None
+    session = series.session
+    assert series.session is session
+    assert ListStats(33)._session is None
+
+def test_children_share_session(fixture_session):
+    series = Series(33, session=fixture_session, parser='lxml')
+    series.populate()
+    children = [related.series for related in series.related_series]
+    children += [rec.series for rec in series.recommendations]
+    children += list(series.category_recommendations)
+    assert children
+    for child in children:
+        assert child.session is fixture_session
+        assert child._parser == 'lxml'
+    assert series.list_stats.session is fixture_session
+
+def test_children_share_lazy_session():
+    series = Series.from_html(33, fixture_bytes('series_33.html'))
+    children = [related.series for related in series.related_series]
+    children += [rec.series for rec in series.recommendations]
+    assert all(child._session is None for child in children)
+    session = children[0].session
+    assert session is not None
+    for child in children[1:]:
+        assert child.session is session
+    assert series.list_stats.session is session
+    assert series.session is session
+    assert pickle.loads(pickle.dumps(series.list_stats))._session_ref is None
+
+def test_identity_map():
+    # series 88 (a copy of series 33's page) recommends itself
+    session = FixtureSession({33: 'series_33.html', 88: 'series_33.html'})
+    identity_map = {}
+    series = Series(33, session=session, identity_map=identity_map)
+    assert identity_map == {33: series}
+    series.populate()
+
+    berserk = next(rec.series for rec in series.recommendations if rec.series.id == 88)
+    assert identity_map[88] is berserk
+    berserk.populate()
+    assert next(rec.series for rec in berserk.recommendations if rec.series.id == 88) is berserk
+    assert ({rec.series.id: rec.series for rec in berserk.recommendations}
+            == {rec.series.id: rec.series for rec in series.recommendations})
+
+    series.populate()   # links resolve to the already populated instances
+    assert next(rec.series for rec in series.recommendations if rec.series.id == 88) is berserk
+
+def test_no_identity_map(fixture_session):
+    series = Series(33, session=fixture_session)
+    series.populate()
+    first = [rec.series for rec in series.recommendations]
+    series.populate()
+    second = [rec.series for rec in series.recommendations]
+    assert all(a is not b for a, b in zip(first, second))
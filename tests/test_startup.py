@@ -0,0 +1,40 @@
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('requests', 'bs4', 'lxml', 'dateutil')
+
+
+def run(code):
+    """Runs `code` in a fresh interpreter with `-X importtime`
+
+    Returns:
+        - tuple(str, dict): stdout, and `{module: cumulative import time (us)}`
+    """
+
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s*\d+ \|\s*(\d+) \| ( *)(\S+)', line)
+        if match and not match.group(2):    # top-level imports only
+            times[match.group(3)] = int(match.group(1))
+    return result.stdout, times
+
+def test_import_defers_heavy_dependencies():
+    stdout, _ = run('import sys, mangaupdates\n'
+                    'series = mangaupdates.Series(33)\n'
+                    'mangaupdates.ListStats(33)\n'
+                    f'print(*[name for name in {HEAVY} if name in sys.modules])')
+    assert stdout.split() == []
+
+def test_import_time():
+    # `import requests` goes last, so none of its modules count for mangaupdates
+    _, times = run('import mangaupdates; mangaupdates.Series; import requests, bs4')
+    package = times['mangaupdates'] + times['mangaupdates.series']
+    dependencies = times['requests'] + times['bs4']
+    print(f'import mangaupdates: {package / 1000:.1f} ms '
+          f'(requests + bs4: {dependencies / 1000:.1f} ms)')
+    assert package < dependencies / 2
@@ -0,0 +1,103 @@
+import pickle
+import pytest
+import requests
+from mangaupdates import ListStats, Series
+from mangaupdates.cache import CachedSession, FileCache
+from mangaupdates.retry import RetrySession
+from mangaupdates.transport import BACKENDS, TIMEOUT, FakeSession, TimeoutSession, make_session
+from .conftest import StubServer, fixture_bytes
+
+
+def test_make_session():
+    session = make_session(concurrency=24, timeout=5)
+    adapter = session.get_adapter('https://www.mangaupdates.com/series.html')
+    assert adapter._pool_maxsize == 24 and adapter._pool_block
+    assert session.get_adapter('http://127.0.0.1/') is adapter
+    assert 'gzip' in session.headers['Accept-Encoding']
+    assert session.headers['Connection'] == 'keep-alive'
+    assert pickle.loads(pickle.dumps(session)).timeout == 5
+
+def test_default_sessions(tmp_path):
+    for session in (Series(33).session, ListStats(33).session, RetrySession().session,
+                    CachedSession(FileCache(tmp_path)).session):
+        assert isinstance(session, TimeoutSession) and session.timeout == TIMEOUT
+
+def test_timeout(monkeypatch):
+    with StubServer({33: 'series_33.html'}, delay=0.5) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        with pytest.raises(requests.exceptions.Timeout):
+            Series(33, session=make_session(timeout=0.1)).populate()
+        Series(33, session=make_session(timeout=0.1)).session.get(
+            f'{server.url}/series.html', params={'id': 33}, timeout=2).raise_for_status()
+
+def test_connections_reused(monkeypatch):
+    with StubServer({id: 'series_sparse.html' for id in range(1, 21)}, delay=0.01) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        session = make_session(concurrency=4)
+        results = dict(Series.fetch_many(range(1, 21), workers=8, session=session))
+        assert not any(isinstance(series, Exception) for series in results.values())
+        pool = session.get_adapter(server.url).poolmanager.connection_from_url(server.url)
+        assert pool.num_connections <= 4
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    if request.param != 'requests':
+        pytest.importorskip(request.param)
+    return request.param
+
+def test_backends(backend, stub_server, monkeypatch):
+    monkeypatch.setattr(Series, 'domain', stub_server.url)
+    monkeypatch.setattr(ListStats, 'domain', stub_server.url)
+    with make_session(backend=backend) as session:
+        series = Series(33, session=RetrySession(session))
+        series.populate()
+        assert series.title == 'One Piece'
+        streamed = Series(33, session=session)
+        streamed.populate(fields=['last_updated'], stream=True)
+        assert streamed.last_updated == series.last_updated
+        assert len(list(ListStats(33, session=session).stream_list('read'))) == 5
+
+        response = session.get(f'{stub_server.url}/series.html', params={'id': 33})
+        assert response.url == f'{stub_server.url}/series.html?id=33'
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            Series(34, session=session).populate()
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.get('http://127.0.0.1:1/series.html')
+
+def test_backend_timeout(backend):
+    with StubServer({33: 'series_33.html'}, delay=0.5) as server:
+        with make_session(timeout=0.1, backend=backend) as session:
+            with pytest.raises(requests.exceptions.Timeout):
+                session.get(f'{server.url}/series.html', params={'id': 33})
+
+def test_backend_pool(backend, monkeypatch):
+    with StubServer({id: 'series_sparse.html' for id in range(1, 21)}, delay=0.02) as server:
+        monkeypatch.setattr(Series, 'domain', server.url)
+        with make_session(concurrency=3, backend=backend) as session:
+            results = dict(Series.fetch_many(range(1, 21), workers=8, session=session))
+        assert not any(isinstance(series, Exception) for series in results.values())
+        assert server.max_in_flight <= 3
+
+def test_backend_pool_timeout(backend, stub_server):
+    url = f'{stub_server.url}/series.html'
+    with make_session(concurrency=1, backend=backend, pool_timeout=0.2) as session:
+        held = session.get(url, params={'id': 34}, stream=True)    # error page, never read
+        with pytest.raises(requests.exceptions.ConnectionError):
+            session.get(url, params={'id': 33})
+        held.close()
+        session.get(url, params={'id': 33}).raise_for_status()
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        make_session(backend='pycurl')
+
+def test_fake_session():
+    pages = {33: fixture_bytes('series_33.html')}
+    session = FakeSession(lambda url, params: pages.get(params['id']))
+    series = Series(33, session=session)
+    series.populate(fields=['last_updated'], stream=True)
+    assert series.last_updated.year == 2021
+    with pytest.raises(requests.exceptions.HTTPError):
+        Series(34, session=session).populate()
+    assert session.requests == 2
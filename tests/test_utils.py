@@ -0,0 +1,64 @@
+import itertools
+import timeit
+import dateutil.parser
+import pytest
+from mangaupdates.utils import parse_timestamp
+
+MONTHS = ('January', 'February', 'March', 'April', 'May', 'June', 'July',
+          'August', 'September', 'October', 'November', 'December')
+
+
+def timestamps(n):
+    """`n` distinct timestamps in the site's format"""
+
+    suffixes = {1: 'st', 2: 'nd', 3: 'rd', 21: 'st', 22: 'nd', 23: 'rd', 31: 'st'}
+    days = itertools.cycle(range(1, 29))
+    minutes = itertools.count()
+    for month, year in itertools.islice(itertools.cycle(itertools.product(MONTHS, range(2000, 2030))), n):
+        day = next(days)
+        minute = next(minutes) % (24 * 60)
+        hour = (minute // 60) % 12 or 12
+        am_pm = 'am' if minute < 12 * 60 else 'pm'
+        yield f'{month} {day}{suffixes.get(day, "th")} {year}, {hour}:{minute % 60:02}{am_pm} UTC'
+
+@pytest.mark.parametrize('string', [*timestamps(50),
+                                    'January 18th 2021, 12:00am UTC',
+                                    'January 18th 2021, 12:59pm UTC',
+                                    'January 18th 2021, 1:48pm',
+                                    'Jan 18th 2021, 1:48pm UTC',
+                                    '2021-01-18 13:48:00'])
+def test_parse_timestamp_matches_dateutil(string):
+    expected = dateutil.parser.parse(string)
+    for _ in range(2):  # learning the time zone, then from the fast path
+        parsed = parse_timestamp(string)
+        assert parsed == expected
+        assert repr(parsed) == repr(expected)
+        parse_timestamp.cache_clear()
+
+def test_parse_timestamp_invalid():
+    with pytest.raises(dateutil.parser.ParserError):
+        parse_timestamp('February 30th 2021, 1:48pm UTC')
+
+def test_parse_timestamp_benchmark():
+    strings = list(timestamps(2000))
+    parse_timestamp(strings[0])     # learn the time zone
+
+    def fast():
+        parse_timestamp.cache_clear()
+        for string in strings:
+            parse_timestamp(string)
+
+    def memoized():
+        for string in strings:
+            parse_timestamp(string)
+
+    def dateutil_parse():
+        for string in strings:
+            dateutil.parser.parse(string)
+
+    results = {name: min(timeit.repeat(function, number=1, repeat=3)) / len(strings)
+               for name, function in [('dateutil', dateutil_parse), ('fast', fast),
+                                      ('memoized', memoized)]}
+    print(', '.join(f'{name}: {seconds * 1e6:.2f} us' for name, seconds in results.items()))
+    assert results['fast'] * 5 < results['dateutil']
+    assert results['memoized'] < results['fast']